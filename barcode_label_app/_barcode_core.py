@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Barcode Core - Shared label drawing helpers
+Font loading, Code128 rasterising and reportlab canvas helpers used by the
+debug label generators and the main barcode app
+"""
+
+# Only the cheap units module is imported up front - the barcode, colour and
+# image modules pull in most of reportlab and are loaded on first use
+from reportlab.lib.units import mm
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+import functools
+import os
+import platform
+
+@functools.lru_cache(maxsize=32)
+def get_font(path, size):
+    """Load a TrueType font once per (path, size) - parsing the TTF tables is slow"""
+    return ImageFont.truetype(path, size)
+
+def load_font(size):
+    """Load the best available font for the current system"""
+    system = platform.system()
+    
+    # Common font paths by OS
+    font_paths = []
+    
+    if system == "Windows":
+        font_paths = [
+            "C:/Windows/Fonts/arial.ttf",
+            "C:/Windows/Fonts/calibri.ttf",
+            "C:/Windows/Fonts/segoeui.ttf"
+        ]
+    elif system == "Darwin":  # macOS
+        font_paths = [
+            "/System/Library/Fonts/Arial.ttf",
+            "/System/Library/Fonts/Helvetica.ttc",
+            "/Library/Fonts/Arial.ttf",
+            "/System/Library/Fonts/Times.ttc"
+        ]
+    else:  # Linux and others
+        font_paths = [
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+            "/usr/share/fonts/TTF/arial.ttf",
+            "/usr/share/fonts/arial.ttf"
+        ]
+    
+    # Try each font path
+    for font_path in font_paths:
+        try:
+            if os.path.exists(font_path):
+                return get_font(font_path, size)
+        except:
+            continue
+    
+    # Try generic font names
+    generic_fonts = ["arial.ttf", "Arial.ttf", "helvetica.ttf", "Helvetica.ttf"]
+    for font_name in generic_fonts:
+        try:
+            return get_font(font_name, size)
+        except:
+            continue
+    
+    # Fall back to default font
+    print(f"Warning: Could not load any system fonts, using default font for size {size}")
+    return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=64)
+def text_sprite(text, size, fill='black'):
+    """Render a constant string once to a transparent RGBA sprite for repeated pasting"""
+    font = load_font(size)
+    _, _, right, bottom = font.getbbox(text)
+    sprite = Image.new('RGBA', (max(1, right), max(1, bottom)), (0, 0, 0, 0))
+    # Drawn at the origin so pasting at (x, y) matches draw.text((x, y), ...)
+    ImageDraw.Draw(sprite).text((0, 0), text, fill=fill, font=font)
+    return sprite
+
+# Narrowest Code128 module we emit in PDFs, in points
+MIN_MODULE_PTS = 0.3
+
+@functools.lru_cache(maxsize=128)
+def _encode_code128(data):
+    """Encode data as Code128 once and return (decomposed pattern, total modules)"""
+    from reportlab.graphics.barcode import code128
+    
+    # Let reportlab encode the data (start code, checksum, stop pattern)
+    # One unit of barWidth per module so width == total module count
+    barcode = code128.Code128(data, barWidth=1, humanReadable=False, quiet=0)
+    module_count = int(barcode.width)
+    return barcode.decomposed, module_count
+
+@functools.lru_cache(maxsize=128)
+def _code128_bars(data):
+    """Return the black bars of a Code128 symbol as (start, width) module runs"""
+    decomposed, module_count = _encode_code128(data)
+    bars = []
+    cursor = 0
+    for char in decomposed:
+        modules = ord(char.upper()) - ord('A') + 1
+        if char.isupper():
+            bars.append((cursor, modules))
+        cursor += modules
+    return tuple(bars), module_count
+
+@functools.lru_cache(maxsize=64)
+def barcode_mask(data, width=280, height=30):
+    """Return a (height, width) boolean array that is True wherever a Code128 bar is drawn"""
+    decomposed, module_count = _encode_code128(data)
+    if module_count > width:
+        # Cutting bars off would leave a barcode that can't be scanned
+        raise ValueError(f"Code128 for '{data}' needs {module_count} px, wider than {width} px")
+    
+    # Use a whole number of pixels per module so every bar stays crisp
+    margin = 20
+    usable_width = width - (2 * margin)
+    module_px = max(1, usable_width // module_count)
+    
+    # Decomposed pattern: uppercase letters are bars, lowercase are spaces,
+    # letter position in the alphabet is the width in modules
+    codes = np.frombuffer(decomposed.encode('ascii'), dtype=np.uint8)
+    is_bar = codes < ord('a')
+    widths = (codes | 0x20) - ord('a') + 1
+    
+    # Expand to one flag per pixel column in a single pass
+    row = np.repeat(np.repeat(is_bar, widths), module_px)
+    
+    # Center the barcode horizontally and mark all bars at once
+    x = max(0, (width - row.size) // 2)
+    mask = np.zeros((height, width), dtype=bool)
+    mask[3:height - 2, x:x + row.size] = row
+    
+    # Cached and shared between callers - keep it read-only
+    mask.flags.writeable = False
+    return mask
+
+def mm_px(value_mm):
+    """Convert a length in mm to the nearest whole pixel (one pixel per point)"""
+    return int(round(value_mm * mm))
+
+def config_mm_to_px(config_mm):
+    """Convert a label config in mm to the main app's pixel values (one pixel per point)"""
+    return {key: int(value * mm) for key, value in config_mm.items()}
+
+def format_app_config(final_config):
+    """Format a label config as the pixel-value lines pasted into the main app's settings"""
+    return "\n".join([
+        f'"width": {final_config["width"]},',
+        f'"height": {final_config["height"]},',
+        f'"pd_x": {final_config["pd_x"]}, "pd_y": {final_config["pd_y"]},',
+        f'"pn_x": {final_config["pn_x"]}, "pn_y": {final_config["pn_y"]},',
+        f'"pr_x": {final_config["pr_x"]}, "pr_y": {final_config["pr_y"]},',
+        f'"sn_x": {final_config["sn_x"]}, "sn_y": {final_config["sn_y"]},',
+        f'"barcode_width": {final_config["barcode_width"]}, "barcode_height": {final_config["barcode_height"]}',
+    ])
+
+# Places the label scripts look for a logo, in order of preference
+DEFAULT_LOGO_PATHS = (
+    "logo.png",              # Current directory
+    "assets/logo.png",       # Assets folder
+    "../logo.png",           # Parent directory
+    "assets/logo copy.png",  # Alternative logo
+)
+
+def find_default_logo():
+    """Return the first default logo path that exists - checked on every call, so a logo added or removed while running is seen"""
+    return next((path for path in DEFAULT_LOGO_PATHS if os.path.exists(path)), None)
+
+# Decoded logos: path -> (mtime, reader). One entry per path - a replaced
+# file overwrites its old reader instead of adding another
+_logo_cache = {}
+
+def add_logo_to_canvas(canvas_obj, logo_path, x_mm, y_mm, width_mm, height_mm):
+    """Add a logo image to the canvas at the specified position and size"""
+    from reportlab.lib.colors import black
+    from reportlab.lib.utils import ImageReader
+    
+    try:
+        # A missing logo is not an error - callers draw their text fallback
+        if not os.path.exists(logo_path):
+            return False
+        
+        # Convert mm to points
+        x_pts = x_mm * mm
+        y_pts = y_mm * mm
+        width_pts = width_mm * mm
+        height_pts = height_mm * mm
+        
+        # Decode each logo once and reuse the reader for every label
+        mtime = os.path.getmtime(logo_path)
+        cached = _logo_cache.get(logo_path)
+        if cached and cached[0] == mtime:
+            reader = cached[1]
+        else:
+            reader = ImageReader(logo_path)
+            _logo_cache[logo_path] = (mtime, reader)
+        
+        canvas_obj.drawImage(reader, x_pts, y_pts, width_pts, height_pts)
+        
+        return True
+        
+    except Exception as e:
+        print(f"Error loading logo from {logo_path}: {e}")
+        # Draw a placeholder rectangle if logo fails to load
+        canvas_obj.setStrokeColor(black)
+        canvas_obj.setFillColor("lightgray")
+        canvas_obj.rect(x_mm * mm, y_mm * mm, width_mm * mm, height_mm * mm, fill=1, stroke=1)
+        
+        # Add text placeholder
+        canvas_obj.setFillColor(black)
+        canvas_obj.setFont("Helvetica", 8)
+        canvas_obj.drawString((x_mm + 2) * mm, (y_mm + height_mm/2) * mm, "LOGO")
+        
+        return False
+
+def create_barcode_directly(canvas_obj, data, x, y, width_mm, height_mm):
+    """Create a barcode directly on the canvas using reportlab's built-in Code128 barcode"""
+    from reportlab.lib.colors import black
+    
+    try:
+        # Convert mm to points
+        width_pts = width_mm * mm
+        height_pts = height_mm * mm
+        
+        # Bar runs are decoded once per payload - repeated labels just re-emit them
+        bars, module_count = _code128_bars(data)
+        
+        # Exact module width for the requested barcode width (first bar is always
+        # black). Below 0.3 points scanners lose the narrow bars, and drawing it
+        # wider would run past the box - fail into the placeholder instead
+        module_pts = width_pts / module_count
+        if module_pts < MIN_MODULE_PTS:
+            raise ValueError(f"{module_count} modules don't fit {width_mm}mm at {MIN_MODULE_PTS}pt per module")
+        
+        # All bars go into one path, filled with a single operator
+        path = canvas_obj.beginPath()
+        for start, modules in bars:
+            path.rect(x + start * module_pts, y, modules * module_pts, height_pts)
+        
+        canvas_obj.saveState()
+        canvas_obj.setFillColor(black)
+        canvas_obj.drawPath(path, fill=1, stroke=0)
+        canvas_obj.restoreState()
+        
+        return True
+    except Exception as e:
+        print(f"Error creating barcode for '{data}': {e}")
+        # Draw a placeholder rectangle if barcode fails
+        canvas_obj.setStrokeColor(black)
+        canvas_obj.setFillColor(black)
+        canvas_obj.rect(x, y, width_mm * mm, height_mm * mm, fill=0, stroke=1)
+        return False
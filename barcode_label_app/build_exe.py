@@ -7,32 +7,50 @@ import os
 import sys
 import subprocess
 import shutil
+import hashlib
 from pathlib import Path
 
+# Records the requirements.txt hash of the last successful install
+REQUIREMENTS_STAMP = ".requirements.sha256"
+
+# Dead weight the app never imports - keeps the onefile exe small
+EXCLUDED_MODULES = [
+    "--exclude-module=pandas.tests",
+    "--exclude-module=numpy.tests",
+    "--exclude-module=PIL.ImageQt",
+    "--exclude-module=tkinter.test",
+    "--exclude-module=matplotlib",
+    "--exclude-module=scipy",
+    "--exclude-module=PyQt5",
+    "--exclude-module=IPython",
+]
+
 def run_command(cmd, description=""):
-    """Run a command and handle errors"""
+    """Run a command (argv list, no intermediate shell) and handle errors"""
     print(f"\n{'='*60}")
     print(f"Running: {description}")
-    print(f"Command: {cmd}")
+    print(f"Command: {' '.join(cmd)}")
     print(f"{'='*60}")
     
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    
-    if result.stdout:
-        print("STDOUT:")
-        print(result.stdout)
+    # Stream output line by line (stderr merged in) so progress shows immediately
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, bufsize=1)
+    for line in process.stdout:
+        print(line, end='')
+    returncode = process.wait()
     
-    if result.stderr:
-        print("STDERR:")
-        print(result.stderr)
-    
-    if result.returncode != 0:
-        print(f"❌ Command failed with return code {result.returncode}")
+    if returncode != 0:
+        print(f"❌ Command failed with return code {returncode}")
         return False
     else:
         print("✅ Command completed successfully")
         return True
 
+def requirements_hash(path="requirements.txt"):
+    """Return the SHA256 of requirements.txt so unchanged installs can be skipped"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
 def main():
     print("🚀 Building Barcode Label Generator Windows Executable")
     print("=" * 60)
@@ -47,20 +65,38 @@ def main():
     else:
         print("⚠️  Warning: Not in a virtual environment. Consider using one.")
     
-    # Install/upgrade pip and required packages
-    print("\n📦 Installing required packages...")
-    if not run_command("pip install --upgrade pip", "Upgrading pip"):
-        return False
-    
-    if not run_command("pip install -r requirements.txt", "Installing requirements"):
-        return False
+    # Install/upgrade pip and required packages - only when requirements.txt changed
+    req_hash = requirements_hash()
+    stamp = Path(REQUIREMENTS_STAMP)
+    if stamp.exists() and stamp.read_text().strip() == req_hash:
+        print("\n📦 requirements.txt unchanged since last install - skipping pip")
+    else:
+        print("\n📦 Installing required packages...")
+        if not run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], "Upgrading pip"):
+            return False
+        
+        if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+                           "Installing requirements"):
+            return False
+        
+        stamp.write_text(req_hash)
     
-    # Clean previous builds
+    # Clean previous builds - build/ holds PyInstaller's analysis cache and is
+    # kept between runs for incremental builds unless --clean is passed
     print("\n🧹 Cleaning previous builds...")
-    for dir_name in ['build', 'dist', '__pycache__']:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-            print(f"Removed {dir_name}")
+    clean_dirs = {'dist', '__pycache__'}
+    if "--clean" in sys.argv:
+        clean_dirs.add('build')
+    else:
+        print("Keeping build/ for an incremental build (pass --clean for a full rebuild)")
+    
+    # One directory read instead of an exists() probe per candidate
+    with os.scandir('.') as entries:
+        targets = [entry for entry in entries
+                   if entry.name in clean_dirs and entry.is_dir(follow_symlinks=False)]
+    for entry in targets:
+        shutil.rmtree(entry.path)
+        print(f"Removed {entry.name}")
     
     # Remove .spec file if exists
     spec_file = "simple_barcode_app.spec"
@@ -71,48 +107,39 @@ def main():
     # Create the executable
     print("\n🔨 Creating Windows executable...")
     
-    # PyInstaller command with all necessary options
+    # PyInstaller command with all necessary options - run under -OO so the
+    # bundled bytecode has docstrings and asserts stripped (smaller archive)
     pyinstaller_cmd = [
-        "pyinstaller",
+        sys.executable, "-OO", "-m", "PyInstaller",
         "--onefile",                    # Create single executable file
-        "--windowed",                   # No console window (GUI app)
+        "--noconfirm",                  # Overwrite dist/ without prompting
+        "--log-level=WARN",             # Only surface problems in the build log
         "--name=BarcodeGenerator",      # Name of the executable
         "--icon=logo.png",              # Use logo as icon (will be converted)
         "--add-data=logo.png;.",        # Include logo file
-        "--add-data=data;data",         # Include data folder
         "--hidden-import=PIL._tkinter_finder",  # Fix PIL+tkinter issues
+        "--hidden-import=_barcode_core",        # Shared barcode/label helpers
         "--hidden-import=tkinter",
         "--hidden-import=tkinter.ttk",
         "--hidden-import=tkinter.filedialog",
         "--hidden-import=tkinter.messagebox",
         "--collect-all=treepoem",       # Include all treepoem files
-        "--collect-all=PIL",            # Include all PIL files
-        "--collect-all=pandas",         # Include all pandas files
+        # PIL and pandas are picked up by PyInstaller's own hooks - collecting
+        # everything pulled in their test suites and optional backends
+        *EXCLUDED_MODULES,
         "simple_barcode_app.py"         # Main script
     ]
     
-    cmd_str = " ".join(pyinstaller_cmd)
+    # --debug keeps the console window so startup errors are visible
+    if "--debug" in sys.argv:
+        print("Debug build: console window enabled")
+    else:
+        pyinstaller_cmd.insert(pyinstaller_cmd.index("--onefile") + 1,
+                               "--windowed")        # No console window (GUI app)
     
-    if not run_command(cmd_str, "Building executable with PyInstaller"):
-        print("\n❌ PyInstaller failed. Trying alternative approach...")
-        
-        # Try without windowed mode for debugging
-        pyinstaller_cmd_debug = [
-            "pyinstaller",
-            "--onefile",
-            "--name=BarcodeGenerator",
-            "--add-data=logo.png;.",
-            "--add-data=data;data",
-            "--hidden-import=PIL._tkinter_finder",
-            "--hidden-import=tkinter",
-            "--hidden-import=tkinter.ttk",
-            "--collect-all=treepoem",
-            "simple_barcode_app.py"
-        ]
-        
-        cmd_debug_str = " ".join(pyinstaller_cmd_debug)
-        if not run_command(cmd_debug_str, "Building executable (debug mode)"):
-            return False
+    if not run_command(pyinstaller_cmd, "Building executable with PyInstaller"):
+        print("\n❌ PyInstaller failed. Re-run with --debug to keep the console window.")
+        return False
     
     # Check if executable was created
     exe_path = os.path.join("dist", "BarcodeGenerator.exe")
@@ -137,7 +164,9 @@ def main():
             shutil.copy2("logo.png", dist_folder)
         
         if os.path.exists("data"):
-            shutil.copytree("data", os.path.join(dist_folder, "data"))
+            # Real copies - users edit the shipped workbook, and a hardlink would
+            # write those edits through to the repo's sample
+            shutil.copytree("data", os.path.join(dist_folder, "data"), dirs_exist_ok=True)
         
         # Create README for distribution
         readme_content = """# Barcode Label Generator
@@ -147,7 +176,7 @@ def main():
 2. No additional installation required!
 
 ## Usage
-1. The app will look for 'data/serial_tracker.xlsx' by default
+1. The app will look for 'data/serial_tracker.xlsx' next to the exe by default
 2. You can browse to select a different Excel file
 3. You can browse to select a custom logo image
 4. Adjust positions using the sliders
@@ -5,133 +5,64 @@ This script generates labels directly as PDF using reportlab for maximum print c
 """
 
 from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm, inch
-from reportlab.lib.pagesizes import letter
-from reportlab.graphics.barcode import code128
-from reportlab.graphics import renderPDF
-from reportlab.graphics.shapes import Drawing
-import hashlib
-import os
-import platform
+from reportlab.lib.units import mm
+from reportlab.lib.colors import black, blue
+from PIL import Image, ImageDraw
+from _barcode_core import barcode_mask, create_barcode_directly, format_app_config, load_font, text_sprite
+import numpy as np
+import sys
 
-def load_font(size):
-    """Load the best available font for the current system"""
-    system = platform.system()
-    
-    # Common font paths by OS
-    font_paths = []
-    
-    if system == "Windows":
-        font_paths = [
-            "C:/Windows/Fonts/arial.ttf",
-            "C:/Windows/Fonts/calibri.ttf",
-            "C:/Windows/Fonts/segoeui.ttf"
-        ]
-    elif system == "Darwin":  # macOS
-        font_paths = [
-            "/System/Library/Fonts/Arial.ttf",
-            "/System/Library/Fonts/Helvetica.ttc",
-            "/Library/Fonts/Arial.ttf",
-            "/System/Library/Fonts/Times.ttc"
-        ]
-    else:  # Linux and others
-        font_paths = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-            "/usr/share/fonts/TTF/arial.ttf",
-            "/usr/share/fonts/arial.ttf"
-        ]
-    
-    # Try each font path
-    for font_path in font_paths:
-        try:
-            if os.path.exists(font_path):
-                return ImageFont.truetype(font_path, size)
-        except:
-            continue
-    
-    # Try generic font names
-    generic_fonts = ["arial.ttf", "Arial.ttf", "helvetica.ttf", "Helvetica.ttf"]
-    for font_name in generic_fonts:
-        try:
-            return ImageFont.truetype(font_name, size)
-        except:
-            continue
-    
-    # Fall back to default font
-    print(f"Warning: Could not load any system fonts, using default font for size {size}")
-    return ImageFont.load_default()
-
-def generate_simple_barcode(data, width=280, height=30):
-    """Generate a simple barcode pattern with proper bars"""
-    img = Image.new('RGB', (width, height), 'white')
+def save_preview_png(config, field_positions, png_filename):
+    """Rasterise the label with PIL for a quick PNG preview of the PDF layout"""
+    
+    barcode_fields = [
+        ('P/N', "CZ5S1000B"),
+        ('P/R', "02"),
+        ('S/N', "CDL2349-1195"),
+    ]
+    data_x = config['field_start_x'] + config['text_offset']
+    bw, bh = config['barcode_width'], config['barcode_height']
+    
+    # Allocate the label once and write every barcode straight into it
+    pixels = np.full((config['height'], config['width'], 3), 255, dtype=np.uint8)
+    for field, data in barcode_fields:
+        y = field_positions[field]
+        region = pixels[y:y + bh, data_x:data_x + bw]
+        mask = barcode_mask(data, bw, bh)[:region.shape[0], :region.shape[1]]
+        region[mask] = 0
+    
+    # Single hand-off to PIL for the border and text
+    img = Image.fromarray(pixels)
     draw = ImageDraw.Draw(img)
     
-    # Create Code128-like pattern manually
-    import hashlib
-    
-    # Use hash to create consistent pattern
-    hash_val = hashlib.md5(data.encode()).hexdigest()
-    
-    # Calculate bar dimensions for proper barcode appearance
-    margin = 20
-    usable_width = width - (2 * margin)
-    bar_count = usable_width - 20  # Ensure we have enough bars
+    # Static strings come from the sprite cache, only the data text is drawn per label
+    font_data = load_font(8)
     
-    if bar_count == 0:
-        bar_count = 20  # Minimum bars
-        
-    narrow_bar = max(1, usable_width // (bar_count * 3))  # Narrow bar width
-    wide_bar = narrow_bar * 2  # Wide bar width
+    def paste_sprite(sprite, xy):
+        img.paste(sprite, xy, sprite)
     
-    x = margin
+    # Draw border
+    draw.rectangle([0, 0, config['width']-1, config['height']-1], outline='black', width=1)
     
-    # Create start pattern (typical for Code128)
-    start_pattern = [1, 1, 0, 1, 0, 1, 1, 0]  # Start B pattern
-    for bar in start_pattern:
-        bar_width = wide_bar if bar else narrow_bar
-        if bar:
-            draw.rectangle([x, 3, x + bar_width - 1, height - 3], fill='black')
-        x += bar_width
-        if x >= width - margin:
-            break
+    # 1. Company logo/text area
+    paste_sprite(text_sprite("CYIENT", 14), (config['logo_x'], config['logo_y']))
+    paste_sprite(text_sprite("DLM", 14, 'blue'), (config['logo_x'] + 60, config['logo_y']))
     
-    # Generate data bars based on hash
-    for i in range(0, min(len(hash_val), 20), 2):
-        if x >= width - margin - 20:  # Leave space for stop pattern
-            break
-            
-        try:
-            hex_val = int(hash_val[i:i+2], 16)
-            
-            # Create alternating bar pattern based on hex value
-            for bit in range(4):
-                bar_width = narrow_bar if (hex_val & (1 << bit)) else wide_bar
-                if hex_val & (1 << bit):
-                    draw.rectangle([x, 3, x + bar_width - 1, height - 3], fill='black')
-                x += bar_width
-                if x >= width - margin - 20:
-                    break
-                    
-        except (ValueError, IndexError):
-            continue
+    # 2. P/D field (NO BARCODE - text only, aligned)
+    pd_y = field_positions['P/D']
+    paste_sprite(text_sprite("P/D", 10), (config['field_start_x'], pd_y))
+    draw.text((data_x, pd_y), "SCB CCA", fill='black', font=font_data)
     
-    # Add stop pattern
-    if x < width - margin:
-        stop_pattern = [1, 1, 0, 0, 1, 1, 1]  # Stop pattern
-        for bar in stop_pattern:
-            if x >= width - 5:
-                break
-            bar_width = narrow_bar
-            if bar:
-                draw.rectangle([x, 3, x + bar_width - 1, height - 3], fill='black')
-            x += bar_width
+    # 3-5. Labels and data text for the barcode fields
+    for field, data in barcode_fields:
+        y = field_positions[field]
+        paste_sprite(text_sprite(field, 10), (config['field_start_x'], y))
+        draw.text((data_x, y + bh + 3), data, fill='black', font=font_data)
     
-    return img
-
-
+    img.save(png_filename, 'PNG', dpi=(300, 300))
+    print(f"Also saved PNG preview: {png_filename}")
 
-def create_perfect_alignment_label():
+def create_perfect_alignment_label(preview=False):
     """Create a label with perfect alignment and field_vertical_gap = 15"""
     
     print("Creating perfectly aligned label with field_vertical_gap = 15...")
@@ -156,69 +87,56 @@ def create_perfect_alignment_label():
         'S/N': 140   # P/R + barcode block + 15 gap
     }
     
-    # Create image
-    img = Image.new('RGB', (config['width'], config['height']), 'white')
-    draw = ImageDraw.Draw(img)
+    # Draw straight onto a PDF page - one point per layout pixel, vector output
+    filename = "debug_label_PERFECT.pdf"
+    # Uncompressed: a throwaway debug artifact is not worth deflating
+    c = canvas.Canvas(filename, pagesize=(config['width'], config['height']), pageCompression=0)
     
-    # Load fonts
-    font_company = load_font(14)
-    font_label = load_font(10)
-    font_data = load_font(8)
+    def flip_y(y_px, text_size=0):
+        """Convert a top-left Y (top of the text/box) to reportlab's bottom-left origin"""
+        return config['height'] - y_px - text_size
+    
+    text_x = config['field_start_x'] + config['text_offset']
     
     # Draw border
-    draw.rectangle([0, 0, config['width']-1, config['height']-1], outline='black', width=1)
+    c.setStrokeColor(black)
+    c.setLineWidth(1)
+    c.rect(0, 0, config['width'], config['height'])
     
     # 1. Company logo/text area
-    draw.text((config['logo_x'], config['logo_y']), "CYIENT", fill='black', font=font_company)
-    draw.text((config['logo_x'] + 60, config['logo_y']), "DLM", fill='blue', font=font_company)
-    
-    # 2. P/D field (NO BARCODE - text only, aligned)
-    pd_y = field_positions['P/D']
-    draw.text((config['field_start_x'], pd_y), "P/D", fill='black', font=font_label)
-    draw.text((config['field_start_x'] + config['text_offset'], pd_y), "SCB CCA", fill='black', font=font_data)
-    
-    # 3. P/N field (with barcode, properly aligned)
-    pn_y = field_positions['P/N']
-    draw.text((config['field_start_x'], pn_y), "P/N", fill='black', font=font_label)
-    pn_barcode = generate_simple_barcode("CZ5S1000B", config['barcode_width'], config['barcode_height'])
-    barcode_y = pn_y   # Small gap after label
-    img.paste(pn_barcode, (config['field_start_x'] + config['text_offset'], barcode_y))
-    data_text_y = barcode_y + config['barcode_height'] + 3
-    draw.text((config['field_start_x'] + config['text_offset'], data_text_y), "CZ5S1000B", fill='black', font=font_data)
-    
-    # 4. P/R field (with barcode, properly aligned)
-    pr_y = field_positions['P/R']
-    draw.text((config['field_start_x'], pr_y), "P/R", fill='black', font=font_label)
-    pr_barcode = generate_simple_barcode("02", config['barcode_width'], config['barcode_height'])
-    barcode_y = pr_y  # Small gap after label
-    img.paste(pr_barcode, (config['field_start_x'] + config['text_offset'], barcode_y))
-    data_text_y = barcode_y + config['barcode_height'] + 3
-    draw.text((config['field_start_x'] + config['text_offset'], data_text_y), "02", fill='black', font=font_data)
-    
-    # 5. S/N field (with barcode, properly aligned)
-    sn_y = field_positions['S/N']
-    draw.text((config['field_start_x'], sn_y), "S/N", fill='black', font=font_label)
-    sn_barcode = generate_simple_barcode("CDL2349-1195", config['barcode_width'], config['barcode_height'])
-    barcode_y = sn_y   # Small gap after label
-    img.paste(sn_barcode, (config['field_start_x'] + config['text_offset'], barcode_y))
-    data_text_y = barcode_y + config['barcode_height'] + 3
-    draw.text((config['field_start_x'] + config['text_offset'], data_text_y), "CDL2349-1195", fill='black', font=font_data)
-    
-    # Save the perfect alignment label as PDF
-    filename = "debug_label_PERFECT.pdf"
-    
-    # Convert to RGB if needed for PDF output
-    if img.mode != 'RGB':
-        img = img.convert('RGB')
-    
-    # Save as PDF with high resolution
-    img.save(filename, 'PDF', dpi=(300, 300), quality=95)
+    c.setFont("Helvetica", 14)
+    c.setFillColor(black)
+    c.drawString(config['logo_x'], flip_y(config['logo_y'], 14), "CYIENT")
+    c.setFillColor(blue)
+    c.drawString(config['logo_x'] + 60, flip_y(config['logo_y'], 14), "DLM")
+    c.setFillColor(black)
+    
+    barcode_fields = (('P/N', "CZ5S1000B"), ('P/R', "02"), ('S/N', "CDL2349-1195"))
+    
+    # 2. Field labels - all four at 10pt under one font switch
+    c.setFont("Helvetica", 10)
+    for field in field_positions:
+        c.drawString(config['field_start_x'], flip_y(field_positions[field], 10), field)
+    
+    # 3. Barcodes - top edge sits on the label line (helper takes mm sizes)
+    for field, data in barcode_fields:
+        create_barcode_directly(c, data, text_x, flip_y(field_positions[field] + config['barcode_height']),
+                                config['barcode_width'] / mm, config['barcode_height'] / mm)
+    
+    # 4. Data text at 8pt - P/D beside its label, the rest under their barcode
+    c.setFont("Helvetica", 8)
+    c.drawString(text_x, flip_y(field_positions['P/D'], 8), "SCB CCA")
+    for field, data in barcode_fields:
+        data_text_y = field_positions[field] + config['barcode_height'] + 3
+        c.drawString(text_x, flip_y(data_text_y, 8), data)
+    
+    c.showPage()
+    c.save()
     print(f"Saved: {filename}")
     
-    # Also save as PNG for quick preview
-    png_filename = "debug_label_PERFECT.png"
-    img.save(png_filename, 'PNG', dpi=(300, 300))
-    print(f"Also saved PNG preview: {png_filename}")
+    # PNG preview is only rasterised on request
+    if preview:
+        save_preview_png(config, field_positions, "debug_label_PERFECT.png")
     
     # Return config for main app
     final_config = {
@@ -233,28 +151,23 @@ def create_perfect_alignment_label():
         'text_offset': config['text_offset']
     }
     
-    print("\nPerfect alignment config for main app:")
-    print(f'"width": {final_config["width"]},')
-    print(f'"height": {final_config["height"]},')
-    print(f'"pd_x": {final_config["pd_x"]}, "pd_y": {final_config["pd_y"]},')
-    print(f'"pn_x": {final_config["pn_x"]}, "pn_y": {final_config["pn_y"]},')
-    print(f'"pr_x": {final_config["pr_x"]}, "pr_y": {final_config["pr_y"]},')
-    print(f'"sn_x": {final_config["sn_x"]}, "sn_y": {final_config["sn_y"]},')
-    print(f'"barcode_width": {final_config["barcode_width"]}, "barcode_height": {final_config["barcode_height"]}')
-    
     return final_config
 
 if __name__ == "__main__":
     print("Debug Label Generator")
     print("====================")
 
+    # Pass --preview to also rasterise a PNG of the label
+    preview = "--preview" in sys.argv
 
     print("Creating perfect alignment label...")
     
     # Create the perfect alignment version
-    perfect_config = create_perfect_alignment_label()
+    perfect_config = create_perfect_alignment_label(preview=preview)
+    print("\nPerfect alignment config for main app:\n" + format_app_config(perfect_config))
     
     print("\nDone! Check the generated files:")
     print("- debug_label_PERFECT.pdf (main output)")
-    print("- debug_label_PERFECT.png (preview)")
+    if preview:
+        print("- debug_label_PERFECT.png (preview)")
     print("\nUse the config values from debug_label_PERFECT.pdf as it should have the best alignment.")
@@ -4,106 +4,13 @@ Debug Label Generator - Create exact label format as expected using direct PDF g
 This script generates labels directly as PDF using reportlab for maximum print clarity
 """
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm, inch, cm
-from reportlab.lib.pagesizes import letter
-from reportlab.graphics.barcode import code128
-from reportlab.graphics import renderPDF
-from reportlab.graphics.shapes import Drawing
-from reportlab.lib.colors import black, blue
-from reportlab.lib.utils import ImageReader
-from PIL import Image
-import os
-
-def add_logo_to_canvas(canvas_obj, logo_path, x_mm, y_mm, width_mm, height_mm):
-    """Add a logo image to the canvas at the specified position and size"""
-    try:
-        # Check if logo file exists
-        if not os.path.exists(logo_path):
-            print(f"Warning: Logo file not found at {logo_path}")
-            return False
-        
-        # Convert mm to points
-        x_pts = x_mm * mm
-        y_pts = y_mm * mm
-        width_pts = width_mm * mm
-        height_pts = height_mm * mm
-        
-        # Load and draw the image
-        canvas_obj.drawImage(logo_path, x_pts, y_pts, width_pts, height_pts)
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error loading logo from {logo_path}: {e}")
-        # Draw a placeholder rectangle if logo fails to load
-        canvas_obj.setStrokeColor(black)
-        canvas_obj.setFillColor("lightgray")
-        canvas_obj.rect(x_mm * mm, y_mm * mm, width_mm * mm, height_mm * mm, fill=1, stroke=1)
-        
-        # Add text placeholder
-        canvas_obj.setFillColor(black)
-        canvas_obj.setFont("Helvetica", 8)
-        canvas_obj.drawString((x_mm + 2) * mm, (y_mm + height_mm/2) * mm, "LOGO")
-        
-        return False
-
-def create_barcode_directly(canvas_obj, data, x, y, width_mm, height_mm):
-    """Create a barcode directly on the canvas using reportlab's built-in Code128 barcode"""
-    try:
-        # Convert mm to points
-        width_pts = width_mm * mm
-        height_pts = height_mm * mm
-        
-        # Calculate the bar width needed to achieve the desired total width
-        # Code128 typically has about 11 bars per character + start/stop patterns
-        # This is an approximation - we'll create the barcode and scale if needed
-        estimated_bars = len(data) * 11 + 35  # Rough estimate including start/stop/check
-        target_bar_width = width_pts / estimated_bars
-        
-        # Ensure minimum bar width for readability (0.3 points minimum)
-        bar_width = max(0.3, target_bar_width)
-        
-        # Create the barcode with calculated bar width
-        # Code128 automatically starts with the correct start pattern (first bar should be black)
-        barcode = code128.Code128(data, 
-                                 barWidth=bar_width,  # Calculated to achieve target width
-                                 barHeight=height_pts,
-                                 humanReadable=False,  # We'll add text separately
-                                 quiet=0)  # No quiet zones - we control positioning
-        
-        # Get the actual width of the generated barcode
-        actual_width = barcode.width
-        
-        # If the barcode is too wide or too narrow, scale it
-        if actual_width > 0:
-            scale_factor = width_pts / actual_width
-            
-            # Save the current graphics state
-            canvas_obj.saveState()
-            
-            # Apply scaling and draw at the correct position
-            canvas_obj.translate(x, y)
-            canvas_obj.scale(scale_factor, 1.0)  # Scale width only, keep height
-            barcode.drawOn(canvas_obj, 0, 0)
-            
-            # Restore the graphics state
-            canvas_obj.restoreState()
-        else:
-            # Fallback: draw without scaling
-            barcode.drawOn(canvas_obj, x, y)
-        
-        return True
-    except Exception as e:
-        print(f"Error creating barcode for '{data}': {e}")
-        # Draw a placeholder rectangle if barcode fails
-        canvas_obj.setStrokeColor(black)
-        canvas_obj.setFillColor(black)
-        canvas_obj.rect(x, y, width_mm * mm, height_mm * mm, fill=0, stroke=1)
-        return False
+from reportlab.lib.units import mm
+from _barcode_core import add_logo_to_canvas, config_mm_to_px, create_barcode_directly, find_default_logo, format_app_config
 
 def create_perfect_pdf_label():
     """Create a perfectly aligned label directly as PDF using reportlab"""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.colors import black, blue
     
     print("Creating PDF label with perfect alignment...")
     
@@ -141,110 +48,92 @@ def create_perfect_pdf_label():
     filename = "debug_label_PERFECT_direct.pdf"
     
     # Create PDF canvas with exact label size
-    c = canvas.Canvas(filename, pagesize=(label_width, label_height))
+    # Debug output - skip the zlib pass, these files are small and throwaway
+    c = canvas.Canvas(filename, pagesize=(label_width, label_height), pageCompression=0)
     
     # Set up coordinate system (reportlab uses bottom-left as origin, we want top-left)
     # We'll flip Y coordinates by subtracting from label height
     
-    def flip_y(y_mm):
+    def flip_y(y_mm, _height=label_height, _mm=mm):
         """Convert top-left Y coordinate to bottom-left for reportlab"""
-        return label_height - (y_mm * mm)
+        return _height - y_mm * _mm
+    
+    # Positions in points, computed once for every field
+    label_x = config_mm['field_start_x'] * mm
+    barcode_x = (config_mm['field_start_x'] + config_mm['text_offset']) * mm
+    data_x = (config_mm['field_start_x'] + config_mm['text_offset'] + config_mm['text_bc_offset']) * mm
+    barcode_width = config_mm['barcode_width']
+    barcode_height = config_mm['barcode_height']
+    
+    # Field table: (label, y in mm, printed data, has barcode)
+    fields = [
+        ("P/D", field_positions_mm['P/D'], "SCB CCA", False),
+        ("P/N", field_positions_mm['P/N'], "CZ5S1000B", True),
+        ("P/R", field_positions_mm['P/R'], "02", True),
+        ("S/N", field_positions_mm['S/N'], "CDL2349-1195", True),
+    ]
+    
+    # Flip every y the fields need once: (label, label y, data, barcode y, data text y)
+    field_rows = [
+        (label, flip_y(y + 3), payload,
+         flip_y(y + barcode_height + 1) if has_barcode else None,
+         flip_y(y + barcode_height + 4) if has_barcode else flip_y(y + 3))
+        for label, y, payload, has_barcode in fields
+    ]
     
     # Draw border
     c.setStrokeColor(black)
     c.setLineWidth(0.5)
     c.rect(0, 0, label_width, label_height)
     
-    # 1. Company logo area
-    # Try to load logo from different possible locations
-    logo_paths = [
-        "logo.png",  # Current directory
-        "assets/logo.png",  # Assets folder
-        "../logo.png",  # Parent directory
-        "assets/logo copy.png"  # Alternative logo
-    ]
-    
+    # 1. Company logo area (first of the default locations that exists)
     logo_loaded = False
-    for logo_path in logo_paths:
-        if os.path.exists(logo_path):
-            logo_loaded = add_logo_to_canvas(c, logo_path, 
-                                           config_mm['logo_x'], 
-                                           flip_y(config_mm['logo_y'] + config_mm['logo_height']) / mm,  # Convert back to mm
-                                           config_mm['logo_width'], 
-                                           config_mm['logo_height'])
-            if logo_loaded:
-                print(f"Logo loaded from: {logo_path}")
-                break
+    logo_path = find_default_logo()
+    if logo_path:
+        logo_loaded = add_logo_to_canvas(c, logo_path, 
+                                       config_mm['logo_x'], 
+                                       flip_y(config_mm['logo_y'] + config_mm['logo_height']) / mm,  # Convert back to mm
+                                       config_mm['logo_width'], 
+                                       config_mm['logo_height'])
+        if logo_loaded:
+            print(f"Logo loaded from: {logo_path}")
     
     # Fallback to text if logo not found
     if not logo_loaded:
         c.setFont("Helvetica-Bold", 14)
         c.setFillColor(black)
-        c.drawString(config_mm['logo_x'] * mm, flip_y(config_mm['logo_y'] + 4), "CYIENT")
+        header_y = flip_y(config_mm['logo_y'] + 4)
+        c.drawString(config_mm['logo_x'] * mm, header_y, "CYIENT")
         
         c.setFillColor(blue)
-        c.drawString((config_mm['logo_x'] + 21) * mm, flip_y(config_mm['logo_y'] + 4), "DLM")
+        c.drawString((config_mm['logo_x'] + 21) * mm, header_y, "DLM")
     
     # Add logo image (uncomment to use)
     # logo_path = "path/to/your/logo.png"
     # add_logo_to_canvas(c, logo_path, config_mm['logo_x'], config_mm['logo_y'], 50, 20)
     
-    # 2. P/D field (text only, no barcode)
+    # 2. Field labels - a single text object for all four
     c.setFillColor(black)
-    c.setFont("Helvetica-Bold", 10)
-    pd_y = field_positions_mm['P/D']
-    c.drawString(config_mm['field_start_x'] * mm , flip_y(pd_y + 3), "P/D")
-    
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, flip_y(pd_y + 3), "SCB CCA")
-    
-    # 3. P/N field (with barcode)
-    c.setFont("Helvetica-Bold", 10)
-    pn_y = field_positions_mm['P/N']
-    c.drawString(config_mm['field_start_x'] * mm, flip_y(pn_y + 3), "P/N")
-    
-    # Draw P/N barcode
-    create_barcode_directly(c, "CZ5S1000B", 
-                           (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                           flip_y(pn_y + config_mm['barcode_height'] + 1),
-                           config_mm['barcode_width'], config_mm['barcode_height'])
-    
-    # P/N text below barcode
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                 flip_y(pn_y + config_mm['barcode_height'] + 4), "CZ5S1000B")
-    
-    # 4. P/R field (with barcode)
-    c.setFont("Helvetica-Bold", 10)
-    pr_y = field_positions_mm['P/R']
-    c.drawString(config_mm['field_start_x'] * mm, flip_y(pr_y + 3), "P/R")
-    
-    # Draw P/R barcode
-    create_barcode_directly(c, "02", 
-                           (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                           flip_y(pr_y + config_mm['barcode_height'] + 1),
-                           config_mm['barcode_width'], config_mm['barcode_height'])
-    
-    # P/R text below barcode
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                 flip_y(pr_y + config_mm['barcode_height'] + 4), "02")
-    
-    # 5. S/N field (with barcode)
-    c.setFont("Helvetica-Bold", 10)
-    sn_y = field_positions_mm['S/N']
-    c.drawString(config_mm['field_start_x'] * mm, flip_y(sn_y + 3), "S/N")
-    
-    # Draw S/N barcode
-    create_barcode_directly(c, "CDL2349-1195", 
-                           (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                           flip_y(sn_y + config_mm['barcode_height'] + 1),
-                           config_mm['barcode_width'], config_mm['barcode_height'])
-    
-    # S/N text below barcode
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                 flip_y(sn_y + config_mm['barcode_height'] + 4), "CDL2349-1195")
+    labels = c.beginText()
+    labels.setFont("Helvetica-Bold", 10)
+    for label, label_y, _, _, _ in field_rows:
+        labels.setTextOrigin(label_x, label_y)
+        labels.textOut(label)
+    c.drawText(labels)
+    
+    # 3. Barcodes (P/D is text only)
+    for _, _, payload, barcode_y, _ in field_rows:
+        if barcode_y is not None:
+            create_barcode_directly(c, payload, barcode_x, barcode_y,
+                                   barcode_width, barcode_height)
+    
+    # 4. Data text - beside the label for text-only fields, below the barcode otherwise
+    data_text = c.beginText()
+    data_text.setFont("Helvetica", 8)
+    for _, _, payload, _, text_y in field_rows:
+        data_text.setTextOrigin(data_x, text_y)
+        data_text.textOut(payload)
+    c.drawText(data_text)
     
     # Save the PDF
     c.save()
@@ -252,32 +141,21 @@ def create_perfect_pdf_label():
     print(f"Saved: {filename}")
     print("PDF generated with maximum clarity using reportlab!")
     
-    # Return configuration for main app (convert back to pixels for consistency)
+    # Return configuration in mm (the layout's own unit) - callers that need
+    # the main app's pixel values convert it themselves
+    field_x = config_mm['field_start_x']
     final_config = {
-        'width': int(label_width_mm * 2.834),  # Convert mm back to approx pixels
-        'height': int(label_height_mm * 2.834),
-        'pd_x': int(config_mm['field_start_x'] * 2.834), 
-        'pd_y': int(field_positions_mm['P/D'] * 2.834),
-        'pn_x': int(config_mm['field_start_x'] * 2.834), 
-        'pn_y': int(field_positions_mm['P/N'] * 2.834),
-        'pr_x': int(config_mm['field_start_x'] * 2.834), 
-        'pr_y': int(field_positions_mm['P/R'] * 2.834),
-        'sn_x': int(config_mm['field_start_x'] * 2.834), 
-        'sn_y': int(field_positions_mm['S/N'] * 2.834),
-        'barcode_width': int(config_mm['barcode_width'] * 2.834), 
-        'barcode_height': int(config_mm['barcode_height'] * 2.834),
-        'text_offset': int(config_mm['text_offset'] * 2.834)
+        'width': label_width_mm,
+        'height': label_height_mm,
+        'pd_x': field_x, 'pd_y': field_positions_mm['P/D'],
+        'pn_x': field_x, 'pn_y': field_positions_mm['P/N'],
+        'pr_x': field_x, 'pr_y': field_positions_mm['P/R'],
+        'sn_x': field_x, 'sn_y': field_positions_mm['S/N'],
+        'barcode_width': config_mm['barcode_width'],
+        'barcode_height': config_mm['barcode_height'],
+        'text_offset': config_mm['text_offset']
     }
     
-    print("\nConfig for main app (pixel values):")
-    print(f'"width": {final_config["width"]},')
-    print(f'"height": {final_config["height"]},')
-    print(f'"pd_x": {final_config["pd_x"]}, "pd_y": {final_config["pd_y"]},')
-    print(f'"pn_x": {final_config["pn_x"]}, "pn_y": {final_config["pn_y"]},')
-    print(f'"pr_x": {final_config["pr_x"]}, "pr_y": {final_config["pr_y"]},')
-    print(f'"sn_x": {final_config["sn_x"]}, "sn_y": {final_config["sn_y"]},')
-    print(f'"barcode_width": {final_config["barcode_width"]}, "barcode_height": {final_config["barcode_height"]}')
-    
     return final_config
 
 
@@ -287,6 +165,7 @@ if __name__ == "__main__":
     
     # Create the main perfect PDF label
     perfect_config = create_perfect_pdf_label()
+    print("\nConfig for main app (pixel values):\n" + format_app_config(config_mm_to_px(perfect_config)))
     
  
     print("\nDone! Generated files:")
@@ -1,10 +1,20 @@
 from setuptools import setup, find_packages
+import codecs
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+# requirements.txt comes from `pip freeze` in PowerShell, which writes UTF-16
+# with a BOM - sniff the BOM instead of assuming UTF-8
+with open("requirements.txt", "rb") as fh:
+    raw = fh.read()
+encoding = "utf-16" if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) else "utf-8-sig"
+
+requirements = []
+for line in raw.decode(encoding).splitlines():
+    line = line.strip()
+    if line and not line.startswith("#"):
+        requirements.append(line)
 
 setup(
     name="barcode-label-generator",
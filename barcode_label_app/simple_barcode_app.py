@@ -10,23 +10,369 @@ Enhanced Barcode Scanner & Label Generator
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import pandas as pd
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
 import os
+import sys
 import json
+import io
+import re
+import shutil
+import queue
+import threading
+import hashlib
+import importlib.util
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 # import win32print, win32ui, win32con
 from PIL import Image, ImageDraw, ImageWin
 
-# PDF generation imports
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm, inch, cm
-from reportlab.lib.pagesizes import letter
-from reportlab.graphics.barcode import code128
-from reportlab.graphics import renderPDF
-from reportlab.graphics.shapes import Drawing
-from reportlab.lib.colors import black, blue
-from reportlab.lib.utils import ImageReader
+# PDF generation imports - the canvas and colours are loaded on first export
+from reportlab.lib.units import mm
+
+# Optional barcode backends - missing ones are skipped and the built-in
+# pattern below is used when neither is installed
+try:
+    import treepoem
+except ImportError:
+    treepoem = None
+try:
+    from barcode import Code128
+    from barcode.writer import ImageWriter
+except ImportError:
+    Code128 = ImageWriter = None
+
+from _barcode_core import add_logo_to_canvas, create_barcode_directly, find_default_logo, get_font, mm_px
+
+@functools.lru_cache(maxsize=64)
+def _simple_barcode_pattern(data, width, height):
+    """Render the hash-based fallback barcode - a pure function of its inputs"""
+    # Bars only differ across the width - mark their columns in one row of
+    # flags (True = black) and stretch it over the bar height at the end
+    row = np.zeros(width, dtype=bool)
+    
+    # Create Code128-like pattern manually, using the hash for a consistent pattern
+    hash_val = hashlib.md5(data.encode()).hexdigest()
+    
+    # Calculate bar dimensions for proper barcode appearance
+    margin = 10
+    usable_width = width - (2 * margin)
+    bar_count = min(len(data) * 6, usable_width // 2)  # Ensure we have enough bars
+    
+    if bar_count == 0:
+        bar_count = 20  # Minimum bars
+        
+    narrow_bar = max(1, usable_width // (bar_count * 3))  # Narrow bar width
+    wide_bar = narrow_bar * 2  # Wide bar width
+    
+    x = margin
+    
+    # Create start pattern (typical for Code128)
+    start_pattern = [1, 1, 0, 1, 0, 1, 1, 0]  # Start B pattern
+    for bar in start_pattern:
+        bar_width = wide_bar if bar else narrow_bar
+        if bar:
+            row[x:x + bar_width] = True
+        x += bar_width
+        if x >= width - margin:
+            break
+    
+    # Generate data bars based on hash
+    for i in range(0, min(len(hash_val), 20), 2):
+        if x >= width - margin - 20:  # Leave space for stop pattern
+            break
+            
+        try:
+            hex_val = int(hash_val[i:i+2], 16)
+            
+            # Create alternating bar pattern based on hex value
+            for bit in range(4):
+                is_bar = (hex_val >> bit) & 1
+                bar_width = wide_bar if (hex_val % 3 == 0) else narrow_bar
+                
+                if is_bar:
+                    row[x:x + bar_width] = True
+                x += bar_width
+                
+                if x >= width - margin - 20:
+                    break
+                    
+        except (ValueError, IndexError):
+            continue
+    
+    # Add stop pattern
+    if x < width - margin:
+        stop_pattern = [1, 1, 0, 0, 1, 1, 1]  # Stop pattern
+        for bar in stop_pattern:
+            if x >= width - 5:
+                break
+            bar_width = narrow_bar
+            if bar:
+                row[x:x + bar_width] = True
+            x += bar_width
+    
+    # Bars run from y=3 to height-3 inclusive; a bool array becomes a 1-bit image
+    # (white where there is no bar)
+    mask = np.zeros((height, width), dtype=bool)
+    mask[3:height - 2] = row
+    return Image.fromarray(~mask)
+
+@functools.lru_cache(maxsize=32)
+def _label_fonts(company_size, label_size, data_size, dlm_size):
+    """Return the four preview fonts in Arial, or PIL's default font if Arial can't be loaded"""
+    # Cached here rather than only per font so a missing Arial is not searched for on every redraw
+    try:
+        return tuple(get_font("arial.ttf", size) for size in (company_size, label_size, data_size, dlm_size))
+    except:
+        return (ImageFont.load_default(),) * 4
+
+@functools.lru_cache(maxsize=1)
+def _ghostscript_available():
+    """Search the PATH for Ghostscript (needed by treepoem) only once per run"""
+    return bool(shutil.which('gs') or shutil.which('gswin64c') or shutil.which('gswin32c'))
+
+def _fit_barcode(barcode_img, width, height):
+    """Convert a backend's barcode to RGB at the label's barcode size"""
+    if barcode_img.mode != 'RGB':
+        barcode_img = barcode_img.convert('RGB')
+    
+    # LANCZOS keeps the bar edges clean - the result is cached and also ends up
+    # in saved PNGs, so it is worth the cost, but only when the size is off
+    if barcode_img.size != (width, height):
+        barcode_img = barcode_img.resize((width, height), Image.Resampling.LANCZOS)
+    return barcode_img
+
+def _treepoem_barcode(data, width, height):
+    """Render a Code128 barcode with treepoem (BWIPP through Ghostscript)"""
+    # Generate Code128 barcode with improved options for clarity
+    barcode_img = treepoem.generate_barcode(
+        barcode_type='code128',
+        data=data,
+        options={
+            'includetext': False, 
+            'height': 0.8,
+            'width': 0.015,
+            'textxalign': 'center'
+        }
+    )
+    return _fit_barcode(barcode_img, width, height)
+
+def _pybarcode_barcode(data, width, height):
+    """Render a Code128 barcode with the python-barcode library"""
+    # Create barcode with python-barcode
+    code = Code128(data, writer=ImageWriter())
+    buffer = io.BytesIO()
+    code.write(buffer, options={
+        'module_width': 0.3,
+        'module_height': 10,
+        'quiet_zone': 2,
+        'font_size': 0,  # No text
+        'text_distance': 0,
+        'background': 'white',
+        'foreground': 'black'
+    })
+    buffer.seek(0)
+    
+    return _fit_barcode(Image.open(buffer), width, height)
+
+@functools.lru_cache(maxsize=1)
+def _barcode_backends():
+    """Return the installed barcode backends as (name, render) pairs, best first - resolved once per run"""
+    backends = []
+    if treepoem is not None and _ghostscript_available():
+        backends.append(("Treepoem barcode", _treepoem_barcode))
+    if Code128 is not None:
+        backends.append(("Python-barcode", _pybarcode_barcode))
+    return tuple(backends)
+
+@functools.lru_cache(maxsize=64)
+def _barcode_image(data, width, height):
+    """Render a Code128 barcode with the first backend that works - cached per (data, size)"""
+    # A backend can still reject a particular value - fall through to the next one
+    for name, render in _barcode_backends():
+        try:
+            return render(data, width, height)
+        except Exception as e:
+            print(f"{name} error: {e}")
+    
+    # Final fallback to simple pattern
+    print(f"Using simple barcode fallback for: {data}")
+    return _simple_barcode_pattern(data, width, height)
+
+# Column names each Excel field may appear under, tried in order (case-insensitive substrings)
+FIELD_COLUMN_NAMES = {
+    'SL.From': ['SL.From', 'SL From', 'SL_From', 'Serial From', 'From'],
+    'SL.End': ['SL.End', 'SL End', 'SL_End', 'Serial End', 'End', 'To'],
+    'P/D': ['P/D', 'PD', 'DESCRIPTION', 'DESC', 'PRODUCT'],
+    'P/N': ['P/N', 'PN', 'PART', 'CPN', 'PART_NUMBER'],
+    'P/R': ['P/R', 'PR', 'REVISION', 'REV', 'VERSION'],
+}
+
+# Patterns for the numeric part of a serial number, tried in order - compiled once
+_SERIAL_PATTERNS = (
+    re.compile(r'(\d+)$'),           # Numbers at the end
+    re.compile(r'(\d+)'),            # Any numbers
+    re.compile(r'(\d+)-(\d+)'),      # Pattern like CDL2349-1195, take the last number
+)
+
+@functools.lru_cache(maxsize=8192)
+def _extract_serial_number(serial_str):
+    """Extract numeric part from a stripped serial number string (cached - range endpoints repeat)"""
+    # Try different patterns to extract numbers
+    for pattern in _SERIAL_PATTERNS:
+        matches = pattern.findall(serial_str)
+        if matches:
+            if isinstance(matches[0], tuple):
+                # For patterns like CDL2349-1195, take the last number
+                return int(matches[0][-1])
+            else:
+                # Take the last match (most specific)
+                return int(matches[-1])
+    
+    # "Any numbers" matches whenever the string holds a digit, so getting here
+    # means there is no number to extract
+    return None
+
+def _label_filename(serial, outdir, used_names):
+    """Return the batch PDF path for a serial, made filesystem-safe and unique.
+
+    used_names collects the (lower-cased) names already handed out - different
+    serials can sanitise to the same name, so the later ones are numbered rather
+    than overwrite each other's PDF.
+    """
+    safe_name = base_name = re.sub(r'[^\w.-]', '_', serial)
+    suffix = 1
+    while safe_name.lower() in used_names:
+        suffix += 1
+        safe_name = f"{base_name}_{suffix}"
+    used_names.add(safe_name.lower())
+    return os.path.join(outdir, f"label_{safe_name}.pdf")
+
+def _render_pdf_label(filename, logo_path, field_data):
+    """Write one label PDF - field_data is the (P/D, P/N, P/R, S/N) text.
+
+    Takes only plain values so batch exports can run it in worker processes.
+    """
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.colors import black, blue
+
+    # Label dimensions in mm (converted from pixels)
+    label_width_mm = 173  # About 490 pixels
+    label_height_mm = 60  # About 170 pixels
+    
+    # Convert to points for reportlab (1 mm = 2.834645669 points)
+    label_width = label_width_mm * mm
+    label_height = label_height_mm * mm
+    
+    def flip_y(y_mm, _height=label_height, _mm=mm):
+        """Convert top-left Y coordinate to bottom-left for reportlab"""
+        return _height - (y_mm * _mm)
+    
+    # Configuration in mm
+    config_mm = {
+        'logo_x': 5,     # 14px ≈ 5mm
+        'logo_y': 2,     # 6px ≈ 2mm  
+        'logo_width': 35,  # Logo width
+        'logo_height': 17, # Logo height
+        'field_start_x': 45,  # 127px ≈ 45mm
+        'text_offset': 15,     # Offset for barcode/text
+        'barcode_width': 90,  # 255px ≈ 90mm
+        'barcode_height': 8, # 23px ≈ 8mm
+        'field_gap': 5.3,     # Gap between fields
+        'text_bc_offset': 0,  # Text barcode offset
+    }
+    
+    # Field positions in mm (converted from pixel positions)
+    field_positions_mm = {
+        'P/D': 6,   # 17px ≈ 6mm
+        'P/N': 14,  # 40px ≈ 14mm  
+        'P/R': 29,  # 82px ≈ 29mm
+        'S/N': 46   # 130px ≈ 46mm
+    }
+    
+    # Create PDF canvas with exact label size - compressed content stream,
+    # invariant metadata so the same label always produces the same bytes
+    c = canvas.Canvas(filename, pagesize=(label_width, label_height),
+                      pageCompression=1, invariant=1)
+    
+    # Draw border
+    c.setStrokeColor(black)
+    c.setLineWidth(0.5)
+    c.rect(0, 0, label_width, label_height)
+    
+    # 1. Company logo area
+    logo_loaded = False
+    if logo_path:
+        logo_loaded = add_logo_to_canvas(c, logo_path, 
+                                           config_mm['logo_x'], 
+                                           flip_y(config_mm['logo_y'] + config_mm['logo_height']) / mm,
+                                           config_mm['logo_width'], 
+                                           config_mm['logo_height'])
+    
+    # Fallback to text if logo not found
+    if not logo_loaded:
+        c.setFont("Helvetica-Bold", 14)
+        c.setFillColor(black)
+        header_y = flip_y(config_mm['logo_y'] + 4)
+        c.drawString(config_mm['logo_x'] * mm, header_y, "CYIENT")
+        
+        c.setFillColor(blue)
+        c.drawString((config_mm['logo_x'] + 21) * mm, header_y, "DLM")
+    
+    pd_data, pn_data, pr_data, sn_data = field_data
+    
+    # Positions in points, computed once for every field
+    label_x = config_mm['field_start_x'] * mm
+    barcode_x = (config_mm['field_start_x'] + config_mm['text_offset']) * mm
+    data_x = (config_mm['field_start_x'] + config_mm['text_offset'] + config_mm['text_bc_offset']) * mm
+    barcode_width = config_mm['barcode_width']
+    barcode_height = config_mm['barcode_height']
+    
+    # Field table: (label, y in mm, printed data, has barcode)
+    fields = [
+        ("P/D", field_positions_mm['P/D'], pd_data, False),
+        ("P/N", field_positions_mm['P/N'], pn_data, True),
+        ("P/R", field_positions_mm['P/R'], pr_data, True),
+        ("S/N", field_positions_mm['S/N'], sn_data, True),
+    ]
+    
+    # Flip every y the fields need once: (label, label y, data, barcode y, data text y)
+    field_rows = [
+        (label, flip_y(y + 3), payload,
+         flip_y(y + barcode_height + 1) if has_barcode else None,
+         flip_y(y + barcode_height + 4 if has_barcode else y + 3))
+        for label, y, payload, has_barcode in fields
+    ]
+    
+    # 2. Field labels - a single text object for all four
+    c.setFillColor(black)
+    labels = c.beginText()
+    labels.setFont("Helvetica-Bold", 10)
+    for label, label_y, _, _, _ in field_rows:
+        labels.setTextOrigin(label_x, label_y)
+        labels.textOut(label)
+    c.drawText(labels)
+    
+    # 3. Barcodes (P/D is text only)
+    for _, _, payload, barcode_y, _ in field_rows:
+        if barcode_y is not None:
+            create_barcode_directly(c, payload, barcode_x, barcode_y,
+                                   barcode_width, barcode_height)
+    
+    # 4. Data text - beside the label for P/D, below the barcode for the rest
+    data_text = c.beginText()
+    data_text.setFont("Helvetica", 8)
+    for _, _, payload, _, text_y in field_rows:
+        data_text.setTextOrigin(data_x, text_y)
+        data_text.textOut(payload)
+    c.drawText(data_text)
+    
+    # Save the PDF
+    c.save()
+    return filename
 
 class EnhancedBarcodeLabelApp:
     def __init__(self):
@@ -35,40 +381,72 @@ class EnhancedBarcodeLabelApp:
         self.root.geometry("1100x700")
         self.root.minsize(900, 600)  # Set minimum size
         
-        # Excel file path - default (relative to script location)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        self.excel_file = os.path.join(script_dir, "data", "serial_tracker.xlsx")
+        # Excel file path - default (data/ ships next to the exe, it is not bundled)
+        if getattr(sys, 'frozen', False):
+            app_dir = os.path.dirname(sys.executable)
+        else:
+            app_dir = os.path.dirname(os.path.abspath(__file__))
+        self.excel_file = os.path.join(app_dir, "data", "serial_tracker.xlsx")
         self.df = None
         
+        # Progress messages on stdout - only when run from source (the exe has no
+        # console) and not under python -O; errors are always printed
+        self.verbose = __debug__ and not getattr(sys, 'frozen', False)
+        
         # Settings file path
-        self.settings_file = os.path.join(script_dir, "label_settings.json")
+        self.settings_file = os.path.join(app_dir, "label_settings.json")
+        self._settings_basename = os.path.basename(self.settings_file)
         
-        # Current data
-        self.current_excel_data = None
+        # md5 of the settings JSON last written by save_settings
+        self._saved_settings_hash = None
+        
+        # Last parsed settings file: ((mtime_ns, size), saved settings dict)
+        self._settings_cache = None
+        
+        # Current data - position of the looked-up row in self.df, None for sample data
+        self.current_row = None
         self.current_label = None
         
-        # UI variables (will be initialized in setup_ui)
-        self.settings_status_var = None
+        # Settings status line - exists before any save/load/reset can run
+        self.settings_status_var = tk.StringVar()
+        
+        # Pending coalesced preview redraw (root.after id) while sliders move
+        self._preview_after_id = None
+        
+        # Scrollable widget the mouse wheel drives, set while the pointer is over it
+        self._scroll_target = None
         
-        # Default label settings - Using exact measurements from debug_label_generator_pdf.py
+        # Last decoded and resized logo: ((path, mtime, width, height), image)
+        self._logo_cache = None
+        
+        # Last rendered border + logo layer: (settings key, image)
+        self._background_cache = None
+        
+        # Label image every redraw renders into, reallocated only on a size change
+        self._scratch_img = None
+        
+        # Default label settings - Using exact measurements from debug_label_generator_pdf.py,
+        # converted from mm to whole pixels once here
         self.default_settings = {
-            'width': 490,            # 173mm converted to pixels (173 * 2.834)
-            'height': 170,           # 60mm converted to pixels (60 * 2.834)
+            'width': mm_px(173),         # 490px
+            'height': mm_px(60),         # 170px
             'logo_path': self.get_default_logo_path(),
-            'logo_x': 14,            # 5mm * 2.834
-            'logo_y': 6,             # 2mm * 2.834 
-            'logo_width': 99,        # 35mm * 2.834
-            'logo_height': 48,       # 17mm * 2.834
-            'pd_x': 127,             # 45mm * 2.834
-            'pd_y': 17,              # 6mm * 2.834
-            'pn_x': 127,             # 45mm * 2.834
-            'pn_y': 40,              # 14mm * 2.834
-            'pr_x': 127,             # 45mm * 2.834
-            'pr_y': 82,              # 29mm * 2.834
-            'sn_x': 127,             # 45mm * 2.834
-            'sn_y': 130,             # 46mm * 2.834
-            'barcode_width': 255,    # 90mm * 2.834
-            'barcode_height': 23,    # 8mm * 2.834
+            'logo_x': mm_px(5),          # 14px
+            'logo_y': mm_px(2),          # 6px
+            'logo_width': mm_px(35),     # 99px
+            'logo_height': mm_px(17),    # 48px
+            # Field column stays at the preview's original 127px - the PDF draws it
+            # at 45mm, which would round to 128px
+            'pd_x': 127,
+            'pd_y': mm_px(6),            # 17px
+            'pn_x': 127,
+            'pn_y': mm_px(14),           # 40px
+            'pr_x': 127,
+            'pr_y': mm_px(29),           # 82px
+            'sn_x': 127,
+            'sn_y': mm_px(46),           # 130px
+            'barcode_width': mm_px(90),  # 255px
+            'barcode_height': mm_px(8),  # 23px
             # Font sizes for different text elements
             'font_company_size': 14,     # For company name/logo text
             'font_label_size': 10,       # For P/D, P/N, P/R, S/N labels
@@ -79,8 +457,13 @@ class EnhancedBarcodeLabelApp:
         # Load settings from file or use defaults
         self.label_settings = self.load_settings()
         
-        # Load Excel file
-        self.load_excel()
+        # Excel data arrives from the startup worker below
+        self._range_index = None
+        self._column_map = None
+        
+        # Bumped by every workbook load - a load that finishes after a newer one
+        # has started is stale and must not replace the newer data
+        self._excel_load_id = 0
         
         # Setup UI
         self.setup_ui()
@@ -91,8 +474,14 @@ class EnhancedBarcodeLabelApp:
         # Update UI from loaded settings
         self.update_ui_from_settings()
         
-        # Generate initial preview
-        self.update_preview()
+        # Read the workbook and decode the logo on a worker thread so the window
+        # appears straight away - the first full preview follows once they are in
+        self.preview_info.config(text="Loading Excel file and logo...")
+        load_id = self._begin_excel_load()
+        excel_file = self.excel_file
+        self.run_in_background(lambda: self._read_startup_assets(excel_file),
+                               functools.partial(self._on_startup_assets_ready, load_id=load_id),
+                               functools.partial(self._on_startup_assets_failed, load_id=load_id))
     
     def get_default_logo_path(self):
         """Get default logo path relative to script location"""
@@ -107,14 +496,20 @@ class EnhancedBarcodeLabelApp:
             # Update settings from UI
             self.update_label_settings()
             
-            # Save to file
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.label_settings, f, indent=2)
+            # Only rewrite the file when the settings differ from the last save
+            settings_json = json.dumps(self.label_settings, indent=2)
+            settings_hash = hashlib.md5(settings_json.encode()).digest()
+            if settings_hash != self._saved_settings_hash or not os.path.exists(self.settings_file):
+                # Write a temp file and swap it in, so a failed save never leaves half a file
+                tmp_file = self.settings_file + '.tmp'
+                with open(tmp_file, 'w') as f:
+                    f.write(settings_json)
+                os.replace(tmp_file, self.settings_file)
+                self._saved_settings_hash = settings_hash
             
-            messagebox.showinfo("Settings Saved", f"Label settings saved to:\n{os.path.basename(self.settings_file)}")
+            messagebox.showinfo("Settings Saved", f"Label settings saved to:\n{self._settings_basename}")
             self.status_var.set("Settings saved successfully")
-            if hasattr(self, 'settings_status_var') and self.settings_status_var:
-                self.settings_status_var.set("✓ Settings saved to file")
+            self.settings_status_var.set("✓ Settings saved to file")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {e}")
@@ -123,17 +518,26 @@ class EnhancedBarcodeLabelApp:
         """Load label settings from JSON file or return defaults"""
         try:
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    saved_settings = json.load(f)
+                # Reparse only when the file has been written since the last load
+                stat = os.stat(self.settings_file)
+                file_key = (stat.st_mtime_ns, stat.st_size)
+                if self._settings_cache and self._settings_cache[0] == file_key:
+                    saved_settings = self._settings_cache[1]
+                else:
+                    with open(self.settings_file, 'r') as f:
+                        saved_settings = json.load(f)
+                    self._settings_cache = (file_key, saved_settings)
                 
                 # Merge with defaults to ensure all keys exist
                 settings = self.default_settings.copy()
                 settings.update(saved_settings)
                 
-                print(f"Loaded settings from {self.settings_file}")
+                if self.verbose:
+                    print(f"Loaded settings from {self.settings_file}")
                 return settings
             else:
-                print("No saved settings found, using defaults")
+                if self.verbose:
+                    print("No saved settings found, using defaults")
                 return self.default_settings.copy()
                 
         except Exception as e:
@@ -149,8 +553,7 @@ class EnhancedBarcodeLabelApp:
                 self.update_preview()
                 messagebox.showinfo("Settings Loaded", "Settings loaded successfully!")
                 self.status_var.set("Settings loaded from file")
-                if hasattr(self, 'settings_status_var') and self.settings_status_var:
-                    self.settings_status_var.set("✓ Settings loaded from saved file")
+                self.settings_status_var.set("✓ Settings loaded from saved file")
             else:
                 messagebox.showinfo("No Settings File", "No saved settings file found. Using current settings.")
         except Exception as e:
@@ -163,35 +566,19 @@ class EnhancedBarcodeLabelApp:
             self.update_ui_from_settings()
             self.update_preview()
             self.status_var.set("Settings reset to defaults")
-            if hasattr(self, 'settings_status_var') and self.settings_status_var:
-                self.settings_status_var.set("Using default settings")
+            self.settings_status_var.set("Using default settings")
     
     def update_ui_from_settings(self):
         """Update UI controls to match current settings"""
         try:
-            # Update all the variable controls
-            self.width_var.set(self.label_settings['width'])
-            self.height_var.set(self.label_settings['height'])
-            self.logo_x_var.set(self.label_settings['logo_x'])
-            self.logo_y_var.set(self.label_settings['logo_y'])
-            self.logo_width_var.set(self.label_settings['logo_width'])
-            self.logo_height_var.set(self.label_settings['logo_height'])
-            self.pd_x_var.set(self.label_settings['pd_x'])
-            self.pd_y_var.set(self.label_settings['pd_y'])
-            self.pn_x_var.set(self.label_settings['pn_x'])
-            self.pn_y_var.set(self.label_settings['pn_y'])
-            self.pr_x_var.set(self.label_settings['pr_x'])
-            self.pr_y_var.set(self.label_settings['pr_y'])
-            self.sn_x_var.set(self.label_settings['sn_x'])
-            self.sn_y_var.set(self.label_settings['sn_y'])
-            self.barcode_width_var.set(self.label_settings['barcode_width'])
-            self.barcode_height_var.set(self.label_settings['barcode_height'])
+            # Update all the slider controls
+            for key, var in self.setting_vars.items():
+                var.set(self.label_settings[key])
             
-            # Update font size controls
-            self.font_company_size_var.set(self.label_settings.get('font_company_size', 14))
-            self.font_label_size_var.set(self.label_settings.get('font_label_size', 10))
-            self.font_data_size_var.set(self.label_settings.get('font_data_size', 9))
-            self.font_dlm_size_var.set(self.label_settings.get('font_dlm_size', 8))
+            # Callers redraw themselves - drop the redraw the var traces just queued
+            if self._preview_after_id:
+                self.root.after_cancel(self._preview_after_id)
+                self._preview_after_id = None
             
             # Update logo path
             logo_path = self.label_settings.get('logo_path')
@@ -203,15 +590,157 @@ class EnhancedBarcodeLabelApp:
         except Exception as e:
             print(f"Error updating UI from settings: {e}")
     
-    def load_excel(self):
-        """Load Excel file"""
+    def run_in_background(self, work, on_done, on_error=None):
+        """Run work() on a worker thread and hand its result to on_done (or what it raised to on_error) on the Tk thread"""
+        # Workers never touch Tk - the Tk thread polls the queue for an (error, result) pair
+        results = queue.Queue()
+        
+        def worker():
+            try:
+                results.put((None, work()))
+            except Exception as e:
+                results.put((e, None))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self._poll_background(results, on_done, on_error or self._report_background_error)
+    
+    def _poll_background(self, results, on_done, on_error):
+        """Pass a worker's result on once it is ready, otherwise check again shortly"""
+        try:
+            error, result = results.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_background, results, on_done, on_error)
+            return
+        if error is not None:
+            on_error(error)
+        else:
+            on_done(result)
+    
+    def _report_background_error(self, error):
+        """Default on_error for run_in_background - show the error instead of waiting forever"""
+        print(f"Background task error: {error}")
+        messagebox.showerror("Error", f"Background task failed: {error}")
+        self.status_var.set(f"Error: {error}")
+    
+    def _begin_excel_load(self):
+        """Start a new workbook load and return its id - results of older loads are ignored"""
+        self._excel_load_id += 1
+        return self._excel_load_id
+    
+    def load_excel_async(self, on_loaded=None):
+        """Load self.excel_file on a worker thread so the window stays responsive"""
+        excel_file = self.excel_file
+        load_id = self._begin_excel_load()
+        
+        def install(result):
+            if load_id != self._excel_load_id:
+                return
+            # Frame, range index and column map are swapped in together
+            self.df, self._range_index, self._column_map = result
+            # A looked-up row position belongs to the previous sheet
+            self.current_row = None
+            if on_loaded:
+                on_loaded()
+        
+        self.run_in_background(lambda: self._read_excel_data(excel_file), install)
+    
+    def _read_startup_assets(self, excel_file):
+        """Worker half of startup: read the workbook and decode the logo, touches no UI"""
+        settings = self.label_settings
+        logo = None
+        if settings['logo_path'] and os.path.exists(settings['logo_path']):
+            try:
+                logo = self._load_logo((settings['logo_path'], os.path.getmtime(settings['logo_path']),
+                                        settings['logo_width'], settings['logo_height']))
+            except Exception as e:
+                print(f"Error loading logo: {e}")
+        return self._read_excel_data(excel_file), logo
+    
+    def _on_startup_assets_ready(self, result, load_id):
+        """Install the startup worker's results and draw the first full preview"""
+        excel_data, logo = result
+        # Keep a logo a resize-triggered preview may already have decoded
+        if logo and not self._logo_cache:
+            self._logo_cache = logo
+        # The user may have loaded a workbook of their own while this one was read
+        if load_id == self._excel_load_id:
+            self.df, self._range_index, self._column_map = excel_data
+            if self.df is None:
+                self.status_var.set("Failed to load Excel file")
+        self.update_preview()
+    
+    def _on_startup_assets_failed(self, error, load_id):
+        """Startup worker raised - report it and show the sample preview"""
+        print(f"Startup load error: {error}")
+        if load_id == self._excel_load_id:
+            self.status_var.set(f"Failed to load Excel file: {error}")
+        self.update_preview()
+    
+    def _read_excel_data(self, excel_file):
+        """Read a workbook and index its columns and serial ranges - returns (df, range index, column map), touches no UI"""
+        # calamine parses xlsx several times faster than openpyxl and returns the
+        # same frame - use it when python-calamine is installed
+        engine = 'calamine' if importlib.util.find_spec("python_calamine") else None
+        
         try:
-            self.df = pd.read_excel(self.excel_file)
-            print(f"Loaded Excel file with {len(self.df)} rows")
-            print(f"Columns: {list(self.df.columns)}")
+            df = pd.read_excel(excel_file, engine=engine)
+            if self.verbose:
+                print(f"Loaded Excel file with {len(df)} rows")
+                print(f"Columns: {list(df.columns)}")
         except Exception as e:
             print(f"Error loading Excel: {e}")
-            self.df = None
+            return None, None, None
+        
+        # Match every field to its column once per load rather than on every scan
+        # (field -> column position, None when the sheet has no such column)
+        column_map = {field: self.find_column_index(names, df) for field, names in FIELD_COLUMN_NAMES.items()}
+        return df, self._build_range_index(df, column_map), column_map
+    
+    def _build_range_index(self, df, column_map):
+        """Parse every serial range once after loading so lookups are a single vectorised compare"""
+        # Returns (from column position, end column position, from numbers, end numbers,
+        # row has a usable range, sorted index or None)
+        sl_from_col = column_map['SL.From']
+        sl_end_col = column_map['SL.End']
+        if sl_from_col is None or sl_end_col is None:
+            return None
+        
+        row_count = len(df)
+        from_nums = np.zeros(row_count, dtype=np.int64)
+        end_nums = np.zeros(row_count, dtype=np.int64)
+        valid = np.zeros(row_count, dtype=bool)
+        
+        for pos, (from_val, end_val) in enumerate(zip(df.iloc[:, sl_from_col], df.iloc[:, sl_end_col])):
+            try:
+                # Skip rows with empty range values
+                if pd.isna(from_val) or pd.isna(end_val):
+                    continue
+                
+                # Extract numeric parts from range
+                from_num = self.extract_serial_number(str(from_val))
+                end_num = self.extract_serial_number(str(end_val))
+                
+                if from_num is None or end_num is None:
+                    continue
+                
+                from_nums[pos] = from_num
+                end_nums[pos] = end_num
+                valid[pos] = True
+                
+            except Exception as e:
+                print(f"Error processing row {pos}: {e}")
+                continue
+        
+        # Sequentially assigned ranges never overlap - sorted by start, a lookup is then
+        # one binary search. Empty ranges can't match and are left out
+        order = np.flatnonzero(valid & (from_nums <= end_nums))
+        order = order[np.argsort(from_nums[order], kind='stable')]
+        from_sorted, end_sorted = from_nums[order], end_nums[order]
+        sorted_index = None
+        if np.all(from_sorted[1:] > end_sorted[:-1]):
+            sorted_index = (order, from_sorted, end_sorted)
+        
+        return (sl_from_col, sl_end_col, from_nums, end_nums, valid, sorted_index)
     
     def setup_ui(self):
         """Setup enhanced UI with preview and controls"""
@@ -290,7 +819,8 @@ class EnhancedBarcodeLabelApp:
         
         ttk.Button(action_frame, text="Update Preview", command=self.update_preview).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(action_frame, text="Save Label", command=self.save_label).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(action_frame, text="Print", command=self.print_label).pack(side=tk.LEFT)
+        ttk.Button(action_frame, text="Print", command=self.print_label).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(action_frame, text="Batch Export", command=self.batch_export_dialog).pack(side=tk.LEFT)
         
         # Status bar
         self.status_var = tk.StringVar()
@@ -317,7 +847,6 @@ class EnhancedBarcodeLabelApp:
         ttk.Button(settings_btn_frame1, text="Reset", command=self.reset_settings, width=10).pack(side=tk.LEFT)
         
         # Settings status on second row
-        self.settings_status_var = tk.StringVar()
         settings_status_label = ttk.Label(settings_mgmt_frame, textvariable=self.settings_status_var, 
                                         font=('Arial', 8), foreground='blue')
         settings_status_label.pack(pady=(2, 0))
@@ -345,107 +874,74 @@ class EnhancedBarcodeLabelApp:
 
         # Add mouse wheel scrolling - cross-platform
         def _on_mousewheel(event):
+            target = self._scroll_target
+            if target is None:
+                return
             # Different platforms use different delta values
             if event.delta:
-                canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+                target.yview_scroll(int(-1*(event.delta/120)), "units")
             else:
                 # For Linux/Unix systems
                 if event.num == 4:
-                    canvas.yview_scroll(-1, "units")
+                    target.yview_scroll(-1, "units")
                 elif event.num == 5:
-                    canvas.yview_scroll(1, "units")
+                    target.yview_scroll(1, "units")
+
+        # Wheel events go to the widget under the pointer, so bind them app-wide
+        # once - hovering only switches the target instead of rebinding
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        canvas.bind_all("<Button-4>", _on_mousewheel)  # Linux
+        canvas.bind_all("<Button-5>", _on_mousewheel)  # Linux
+        
+        def _set_scroll_target(event):
+            self._scroll_target = canvas
+        
+        def _clear_scroll_target(event):
+            self._scroll_target = None
+        
+        canvas.bind('<Enter>', _set_scroll_target)
+        canvas.bind('<Leave>', _clear_scroll_target)
 
-        def _bind_to_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-            canvas.bind_all("<Button-4>", _on_mousewheel)  # Linux
-            canvas.bind_all("<Button-5>", _on_mousewheel)  # Linux
-        
-        def _unbind_from_mousewheel(event):
-            canvas.unbind_all("<MouseWheel>")
-            canvas.unbind_all("<Button-4>")
-            canvas.unbind_all("<Button-5>")
-        
-        canvas.bind('<Enter>', _bind_to_mousewheel)
-        canvas.bind('<Leave>', _unbind_from_mousewheel)
+        # One IntVar per slider, keyed like label_settings - every var's write trace
+        # feeds the same coalesced redraw
+        self.setting_vars = {}
+
+        def add_sliders(frame, sliders, value_column=None, columnspan=1):
+            """Grid a label + slider row for each (row, text, key, from, to) entry"""
+            for row, text, key, from_, to in sliders:
+                var = tk.IntVar(value=self.label_settings[key])
+                var.trace_add('write', self.on_setting_change)
+                self.setting_vars[key] = var
+                ttk.Label(frame, text=text).grid(row=row, column=0, sticky=tk.W)
+                ttk.Scale(frame, from_=from_, to=to, variable=var,
+                         orient=tk.HORIZONTAL).grid(row=row, column=1, sticky=tk.EW, columnspan=columnspan)
+                if value_column is not None:
+                    ttk.Label(frame, textvariable=var).grid(row=row, column=value_column)
+            frame.columnconfigure(1, weight=1)
 
         # Label dimensions (83mm x 32mm) - more compact
         dims_frame = ttk.LabelFrame(scrollable_frame, text="Dimensions (83mm x 32mm)", padding="3")
         dims_frame.pack(fill=tk.X, pady=(0, 3))
-
-        ttk.Label(dims_frame, text="Width:").grid(row=0, column=0, sticky=tk.W)
-        self.width_var = tk.IntVar(value=self.label_settings['width'])
-        ttk.Scale(dims_frame, from_=300, to=700, variable=self.width_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=0, column=1, sticky=tk.EW)
-        ttk.Label(dims_frame, textvariable=self.width_var).grid(row=0, column=2)
-
-        ttk.Label(dims_frame, text="Height:").grid(row=1, column=0, sticky=tk.W)
-        self.height_var = tk.IntVar(value=self.label_settings['height'])
-        ttk.Scale(dims_frame, from_=150, to=350, variable=self.height_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=1, column=1, sticky=tk.EW)
-        ttk.Label(dims_frame, textvariable=self.height_var).grid(row=1, column=2)
-
-        dims_frame.columnconfigure(1, weight=1)
+        add_sliders(dims_frame, [
+            (0, "Width:", 'width', 300, 700),
+            (1, "Height:", 'height', 150, 350),
+        ], value_column=2)
 
         # Position controls for new label format - more compact
         pos_frame = ttk.LabelFrame(scrollable_frame, text="Positions", padding="3")
         pos_frame.pack(fill=tk.X, pady=(0, 3))
-
-        # Logo position
-        ttk.Label(pos_frame, text="Logo X:").grid(row=0, column=0, sticky=tk.W)
-        self.logo_x_var = tk.IntVar(value=self.label_settings['logo_x'])
-        ttk.Scale(pos_frame, from_=0, to=200, variable=self.logo_x_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=0, column=1, sticky=tk.EW)
-        
-        ttk.Label(pos_frame, text="Logo Y:").grid(row=1, column=0, sticky=tk.W)
-        self.logo_y_var = tk.IntVar(value=self.label_settings['logo_y'])
-        ttk.Scale(pos_frame, from_=0, to=100, variable=self.logo_y_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=1, column=1, sticky=tk.EW)
-
-        # P/D position
-        ttk.Label(pos_frame, text="P/D X:").grid(row=2, column=0, sticky=tk.W)
-        self.pd_x_var = tk.IntVar(value=self.label_settings['pd_x'])
-        ttk.Scale(pos_frame, from_=0, to=480, variable=self.pd_x_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=2, column=1, sticky=tk.EW)
-
-        ttk.Label(pos_frame, text="P/D Y:").grid(row=3, column=0, sticky=tk.W)
-        self.pd_y_var = tk.IntVar(value=self.label_settings['pd_y'])
-        ttk.Scale(pos_frame, from_=0, to=250, variable=self.pd_y_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=3, column=1, sticky=tk.EW)
-
-        # P/N position
-        ttk.Label(pos_frame, text="P/N X:").grid(row=4, column=0, sticky=tk.W)
-        self.pn_x_var = tk.IntVar(value=self.label_settings['pn_x'])
-        ttk.Scale(pos_frame, from_=0, to=480, variable=self.pn_x_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=4, column=1, sticky=tk.EW)
-
-        ttk.Label(pos_frame, text="P/N Y:").grid(row=5, column=0, sticky=tk.W)
-        self.pn_y_var = tk.IntVar(value=self.label_settings['pn_y'])
-        ttk.Scale(pos_frame, from_=0, to=250, variable=self.pn_y_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=5, column=1, sticky=tk.EW)
-
-        # P/R position
-        ttk.Label(pos_frame, text="P/R X:").grid(row=6, column=0, sticky=tk.W)
-        self.pr_x_var = tk.IntVar(value=self.label_settings['pr_x'])
-        ttk.Scale(pos_frame, from_=0, to=480, variable=self.pr_x_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=6, column=1, sticky=tk.EW)
-
-        ttk.Label(pos_frame, text="P/R Y:").grid(row=7, column=0, sticky=tk.W)
-        self.pr_y_var = tk.IntVar(value=self.label_settings['pr_y'])
-        ttk.Scale(pos_frame, from_=0, to=250, variable=self.pr_y_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=7, column=1, sticky=tk.EW)
-
-        # S/N position
-        ttk.Label(pos_frame, text="S/N X:").grid(row=8, column=0, sticky=tk.W)
-        self.sn_x_var = tk.IntVar(value=self.label_settings['sn_x'])
-        ttk.Scale(pos_frame, from_=0, to=480, variable=self.sn_x_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=8, column=1, sticky=tk.EW)
-
-        ttk.Label(pos_frame, text="S/N Y:").grid(row=9, column=0, sticky=tk.W)
-        self.sn_y_var = tk.IntVar(value=self.label_settings['sn_y'])
-        ttk.Scale(pos_frame, from_=0, to=250, variable=self.sn_y_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=9, column=1, sticky=tk.EW)
-
-        pos_frame.columnconfigure(1, weight=1)
+        add_sliders(pos_frame, [
+            (0, "Logo X:", 'logo_x', 0, 200),
+            (1, "Logo Y:", 'logo_y', 0, 100),
+            (2, "P/D X:", 'pd_x', 0, 480),
+            (3, "P/D Y:", 'pd_y', 0, 250),
+            (4, "P/N X:", 'pn_x', 0, 480),
+            (5, "P/N Y:", 'pn_y', 0, 250),
+            (6, "P/R X:", 'pr_x', 0, 480),
+            (7, "P/R Y:", 'pr_y', 0, 250),
+            (8, "S/N X:", 'sn_x', 0, 480),
+            (9, "S/N Y:", 'sn_y', 0, 250),
+        ])
 
         # Logo settings - more compact
         logo_frame = ttk.LabelFrame(scrollable_frame, text="Logo", padding="3")
@@ -460,67 +956,28 @@ class EnhancedBarcodeLabelApp:
         ttk.Button(logo_frame, text="Clear", command=self.clear_logo).grid(row=0, column=3, padx=(5, 0))
 
         # Logo size controls
-        ttk.Label(logo_frame, text="Logo Width:").grid(row=1, column=0, sticky=tk.W)
-        self.logo_width_var = tk.IntVar(value=self.label_settings['logo_width'])
-        ttk.Scale(logo_frame, from_=50, to=300, variable=self.logo_width_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=1, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(logo_frame, textvariable=self.logo_width_var).grid(row=1, column=3)
-
-        ttk.Label(logo_frame, text="Logo Height:").grid(row=2, column=0, sticky=tk.W)
-        self.logo_height_var = tk.IntVar(value=self.label_settings['logo_height'])
-        ttk.Scale(logo_frame, from_=20, to=100, variable=self.logo_height_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=2, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(logo_frame, textvariable=self.logo_height_var).grid(row=2, column=3)
-
-        logo_frame.columnconfigure(1, weight=1)
+        add_sliders(logo_frame, [
+            (1, "Logo Width:", 'logo_width', 50, 300),
+            (2, "Logo Height:", 'logo_height', 20, 100),
+        ], value_column=3, columnspan=2)
 
         # Barcode settings - more compact
         barcode_frame = ttk.LabelFrame(scrollable_frame, text="Barcode", padding="3")
         barcode_frame.pack(fill=tk.X, pady=(0, 3))
-
-        ttk.Label(barcode_frame, text="Barcode Width:").grid(row=0, column=0, sticky=tk.W)
-        self.barcode_width_var = tk.IntVar(value=self.label_settings['barcode_width'])
-        ttk.Scale(barcode_frame, from_=200, to=450, variable=self.barcode_width_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=0, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(barcode_frame, textvariable=self.barcode_width_var).grid(row=0, column=3)
-
-        ttk.Label(barcode_frame, text="Barcode Height:").grid(row=1, column=0, sticky=tk.W)
-        self.barcode_height_var = tk.IntVar(value=self.label_settings['barcode_height'])
-        ttk.Scale(barcode_frame, from_=15, to=60, variable=self.barcode_height_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=1, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(barcode_frame, textvariable=self.barcode_height_var).grid(row=1, column=3)
-
-        barcode_frame.columnconfigure(1, weight=1)
+        add_sliders(barcode_frame, [
+            (0, "Barcode Width:", 'barcode_width', 200, 450),
+            (1, "Barcode Height:", 'barcode_height', 15, 60),
+        ], value_column=3, columnspan=2)
 
         # Font size settings - more compact
         font_frame = ttk.LabelFrame(scrollable_frame, text="Font Sizes", padding="3")
         font_frame.pack(fill=tk.X, pady=(0, 3))
-
-        ttk.Label(font_frame, text="Company Font:").grid(row=0, column=0, sticky=tk.W)
-        self.font_company_size_var = tk.IntVar(value=self.label_settings.get('font_company_size', 14))
-        ttk.Scale(font_frame, from_=8, to=24, variable=self.font_company_size_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=0, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(font_frame, textvariable=self.font_company_size_var).grid(row=0, column=3)
-
-        ttk.Label(font_frame, text="Label Font (P/D, P/N):").grid(row=1, column=0, sticky=tk.W)
-        self.font_label_size_var = tk.IntVar(value=self.label_settings.get('font_label_size', 10))
-        ttk.Scale(font_frame, from_=6, to=18, variable=self.font_label_size_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=1, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(font_frame, textvariable=self.font_label_size_var).grid(row=1, column=3)
-
-        ttk.Label(font_frame, text="Data Font:").grid(row=2, column=0, sticky=tk.W)
-        self.font_data_size_var = tk.IntVar(value=self.label_settings.get('font_data_size', 9))
-        ttk.Scale(font_frame, from_=6, to=16, variable=self.font_data_size_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=2, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(font_frame, textvariable=self.font_data_size_var).grid(row=2, column=3)
-
-        ttk.Label(font_frame, text="DLM Font:").grid(row=3, column=0, sticky=tk.W)
-        self.font_dlm_size_var = tk.IntVar(value=self.label_settings.get('font_dlm_size', 8))
-        ttk.Scale(font_frame, from_=5, to=14, variable=self.font_dlm_size_var,
-                 orient=tk.HORIZONTAL, command=self.on_setting_change).grid(row=3, column=1, sticky=tk.EW, columnspan=2)
-        ttk.Label(font_frame, textvariable=self.font_dlm_size_var).grid(row=3, column=3)
-
-        font_frame.columnconfigure(1, weight=1)
+        add_sliders(font_frame, [
+            (0, "Company Font:", 'font_company_size', 8, 24),
+            (1, "Label Font (P/D, P/N):", 'font_label_size', 6, 18),
+            (2, "Data Font:", 'font_data_size', 6, 16),
+            (3, "DLM Font:", 'font_dlm_size', 5, 14),
+        ], value_column=3, columnspan=2)
 
         canvas.pack(side='left', fill='both', expand=True)
         scrollbar_ctrl.pack(side='right', fill='y')
@@ -535,6 +992,10 @@ class EnhancedBarcodeLabelApp:
         self.preview_canvas = tk.Canvas(preview_frame, bg='white', width=400, height=220)
         self.preview_canvas.pack(expand=True, fill=tk.BOTH)
         
+        # One image item and one PhotoImage, updated in place on every redraw
+        self.preview_image_id = self.preview_canvas.create_image(0, 0, anchor=tk.NW)
+        self.preview_photo = None
+        
         # Preview info
         info_frame = ttk.Frame(preview_frame)
         info_frame.pack(fill=tk.X, pady=(10, 0))
@@ -543,7 +1004,18 @@ class EnhancedBarcodeLabelApp:
         self.preview_info.pack()
     
     def on_setting_change(self, *args):
-        """Called when any setting changes"""
+        """Called when any setting changes - schedules one redraw for a burst of slider ticks"""
+        self.schedule_preview()
+    
+    def schedule_preview(self, delay_ms=30):
+        """Redraw the preview once, delay_ms after the last of a burst of calls"""
+        if self._preview_after_id:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(delay_ms, self._do_preview)
+    
+    def _do_preview(self):
+        """Apply the latest slider values and redraw the preview once"""
+        self._preview_after_id = None
         self.update_label_settings()
         self.update_preview()
     
@@ -551,29 +1023,9 @@ class EnhancedBarcodeLabelApp:
     
     def update_label_settings(self):
         """Update internal label settings from UI"""
-        self.label_settings.update({
-            'width': self.width_var.get(),
-            'height': self.height_var.get(),
-            'logo_path': self.logo_path_var.get() if self.logo_path_var.get() != "No logo selected" else None,
-            'logo_x': self.logo_x_var.get(),
-            'logo_y': self.logo_y_var.get(),
-            'logo_width': self.logo_width_var.get(),
-            'logo_height': self.logo_height_var.get(),
-            'pd_x': self.pd_x_var.get(),
-            'pd_y': self.pd_y_var.get(),
-            'pn_x': self.pn_x_var.get(),
-            'pn_y': self.pn_y_var.get(),
-            'pr_x': self.pr_x_var.get(),
-            'pr_y': self.pr_y_var.get(),
-            'sn_x': self.sn_x_var.get(),
-            'sn_y': self.sn_y_var.get(),
-            'barcode_width': self.barcode_width_var.get(),
-            'barcode_height': self.barcode_height_var.get(),
-            'font_company_size': self.font_company_size_var.get(),
-            'font_label_size': self.font_label_size_var.get(),
-            'font_data_size': self.font_data_size_var.get(),
-            'font_dlm_size': self.font_dlm_size_var.get()
-        })
+        self.label_settings.update({key: var.get() for key, var in self.setting_vars.items()})
+        logo_path = self.logo_path_var.get()
+        self.label_settings['logo_path'] = logo_path if logo_path != "No logo selected" else None
     
     def browse_logo(self):
         """Browse for logo image file"""
@@ -589,12 +1041,16 @@ class EnhancedBarcodeLabelApp:
         if filename:
             self.logo_path_var.set(filename)
             self.label_settings['logo_path'] = filename
+            self._logo_cache = None
+            self._background_cache = None
             self.update_preview()
     
     def clear_logo(self):
         """Clear the selected logo"""
         self.logo_path_var.set("No logo selected")
         self.label_settings['logo_path'] = None
+        self._logo_cache = None
+        self._background_cache = None
         self.update_preview()
     
     def browse_excel(self):
@@ -609,7 +1065,11 @@ class EnhancedBarcodeLabelApp:
     def load_selected_excel(self):
         """Load the selected Excel file"""
         self.excel_file = self.excel_path_var.get()
-        self.load_excel()
+        self.status_var.set(f"Loading Excel: {os.path.basename(self.excel_file)}...")
+        self.load_excel_async(self.on_selected_excel_loaded)
+    
+    def on_selected_excel_loaded(self):
+        """Report the result of a background load started from the Load button"""
         if self.df is not None:
             self.status_var.set(f"Loaded Excel: {os.path.basename(self.excel_file)}")
         else:
@@ -628,11 +1088,8 @@ class EnhancedBarcodeLabelApp:
         
         self.status_var.set(f"Searching for serial number: {serial_number}")
         
-        # Find the SL.From and SL.End columns
-        sl_from_col = self.find_column(['SL.From', 'SL From', 'SL_From', 'Serial From', 'From'])
-        sl_end_col = self.find_column(['SL.End', 'SL End', 'SL_End', 'Serial End', 'End', 'To'])
-        
-        if not sl_from_col or not sl_end_col:
+        # Serial range columns are located and parsed once, when the Excel file loads
+        if self._range_index is None:
             messagebox.showerror("Error", 
                 f"Could not find serial range columns!\n"
                 f"Looking for columns like: SL.From, SL From, SL.End, SL End\n"
@@ -645,189 +1102,57 @@ class EnhancedBarcodeLabelApp:
             messagebox.showerror("Error", f"Could not extract numeric part from serial number: {serial_number}")
             return
         
-        # Search for matching range
-        found_rows = []
+        sl_from_col, sl_end_col, from_nums, end_nums = self._range_index[:4]
+        found_rows = self.find_range_rows(input_serial_num)
         
-        for idx, row in self.df.iterrows():
-            try:
-                # Get range values
-                from_val = row[sl_from_col]
-                end_val = row[sl_end_col]
-                
-                # Skip rows with empty range values
-                if pd.isna(from_val) or pd.isna(end_val):
-                    continue
-                
-                # Extract numeric parts from range
-                from_num = self.extract_serial_number(str(from_val))
-                end_num = self.extract_serial_number(str(end_val))
-                
-                if from_num is None or end_num is None:
-                    continue
-                
-                # Check if input serial number is within range
-                if from_num <= input_serial_num <= end_num:
-                    found_rows.append((idx, row))
-                    print(f"Found match: {serial_number} ({input_serial_num}) is between {from_val} ({from_num}) and {end_val} ({end_num})")
-                
-            except Exception as e:
-                print(f"Error processing row {idx}: {e}")
-                continue
+        if self.verbose:
+            for pos in found_rows:
+                print(f"Found match: {serial_number} ({input_serial_num}) is between "
+                      f"{self.df.iat[pos, sl_from_col]} ({from_nums[pos]}) and {self.df.iat[pos, sl_end_col]} ({end_nums[pos]})")
         
-        if not found_rows:
+        if not found_rows.size:
             messagebox.showerror("Error", f"No range found for serial number: {serial_number}")
-            self.current_excel_data = None
+            self.current_row = None
             self.status_var.set(f"No range found for serial: {serial_number}")
             self.update_preview()
             return
         
-        # Use first match for label generation
-        self.current_excel_data = found_rows[0][1].to_dict()
+        # Use first match for label generation - fields are read straight from self.df
+        self.current_row = int(found_rows[0])
         self.update_preview()
         self.print_label()
         self.status_var.set(f"Scanned {serial_number} - sent to printer")
         self.barcode_var.set("")
         self.barcode_entry.focus()
     
-    def generate_barcode(self, data, width=350, height=35):
-        """Generate a clean Code128 barcode with multiple fallback options"""
-        
-        # First, try treepoem if available
-        try:
-            import shutil
-            # Check for Ghostscript executable
-            if shutil.which('gs') or shutil.which('gswin64c') or shutil.which('gswin32c'):
-                import treepoem
-                
-                # Generate Code128 barcode with improved options for clarity
-                barcode_img = treepoem.generate_barcode(
-                    barcode_type='code128',
-                    data=data,
-                    options={
-                        'includetext': False, 
-                        'height': 0.8,
-                        'width': 0.015,
-                        'textxalign': 'center'
-                    }
-                )
-                
-                if barcode_img.mode != 'RGB':
-                    barcode_img = barcode_img.convert('RGB')
-                    
-                # Resize for better quality
-                final_img = barcode_img.resize((width, height), Image.Resampling.LANCZOS)
-                return final_img
-                
-        except Exception as e:
-            print(f"Treepoem barcode error: {e}")
-        
-        # Second, try python-barcode library
-        try:
-            from barcode import Code128
-            from barcode.writer import ImageWriter
-            import io
-            
-            # Create barcode with python-barcode
-            code = Code128(data, writer=ImageWriter())
-            buffer = io.BytesIO()
-            code.write(buffer, options={
-                'module_width': 0.3,
-                'module_height': 10,
-                'quiet_zone': 2,
-                'font_size': 0,  # No text
-                'text_distance': 0,
-                'background': 'white',
-                'foreground': 'black'
-            })
-            buffer.seek(0)
-            
-            barcode_img = Image.open(buffer)
-            if barcode_img.mode != 'RGB':
-                barcode_img = barcode_img.convert('RGB')
-                
-            # Resize to target size
-            final_img = barcode_img.resize((width, height), Image.Resampling.LANCZOS)
-            return final_img
-            
-        except Exception as e:
-            print(f"Python-barcode error: {e}")
-        
-        # Final fallback to simple pattern
-        print(f"Using simple barcode fallback for: {data}")
-        return self.generate_simple_barcode(data, width, height)
+    def find_range_rows(self, serial_num):
+        """Positions of the rows whose serial range contains serial_num, in file order"""
+        _, _, from_nums, end_nums, valid, sorted_index = self._range_index
+        if sorted_index is not None:
+            # Disjoint ranges - only the last one starting at or before serial_num can hold it
+            order, from_sorted, end_sorted = sorted_index
+            pos = np.searchsorted(from_sorted, serial_num, side='right') - 1
+            if pos >= 0 and serial_num <= end_sorted[pos]:
+                return order[pos:pos + 1]
+            return order[:0]
+        
+        # Overlapping ranges - search every range at once
+        return np.flatnonzero(valid & (from_nums <= serial_num) & (serial_num <= end_nums))
     
-    def generate_simple_barcode(self, data, width=350, height=35):
-        """Fallback: Generate a simple barcode pattern with proper bars"""
-        img = Image.new('RGB', (width, height), 'white')
-        draw = ImageDraw.Draw(img)
-        
-        # Create Code128-like pattern manually
-        import hashlib
-        
-        # Use hash to create consistent pattern
-        hash_val = hashlib.md5(data.encode()).hexdigest()
-        
-        # Calculate bar dimensions for proper barcode appearance
-        margin = 10
-        usable_width = width - (2 * margin)
-        bar_count = min(len(data) * 6, usable_width // 2)  # Ensure we have enough bars
-        
-        if bar_count == 0:
-            bar_count = 20  # Minimum bars
-            
-        narrow_bar = max(1, usable_width // (bar_count * 3))  # Narrow bar width
-        wide_bar = narrow_bar * 2  # Wide bar width
-        
-        x = margin
-        
-        # Create start pattern (typical for Code128)
-        start_pattern = [1, 1, 0, 1, 0, 1, 1, 0]  # Start B pattern
-        for bar in start_pattern:
-            bar_width = wide_bar if bar else narrow_bar
-            if bar:
-                draw.rectangle([x, 3, x + bar_width - 1, height - 3], fill='black')
-            x += bar_width
-            if x >= width - margin:
-                break
-        
-        # Generate data bars based on hash
-        for i in range(0, min(len(hash_val), 20), 2):
-            if x >= width - margin - 20:  # Leave space for stop pattern
-                break
-                
-            try:
-                hex_val = int(hash_val[i:i+2], 16)
-                
-                # Create alternating bar pattern based on hex value
-                for bit in range(4):
-                    is_bar = (hex_val >> bit) & 1
-                    bar_width = wide_bar if (hex_val % 3 == 0) else narrow_bar
-                    
-                    if is_bar:
-                        draw.rectangle([x, 3, x + bar_width - 1, height - 3], fill='black')
-                    x += bar_width
-                    
-                    if x >= width - margin - 20:
-                        break
-                        
-            except (ValueError, IndexError):
-                continue
+    def _load_logo(self, logo_key):
+        """Decode and resize a logo for the label - returns (logo_key, image)"""
+        logo_path, _, logo_width, logo_height = logo_key
+        logo_img = Image.open(logo_path)
         
-        # Add stop pattern
-        if x < width - margin:
-            stop_pattern = [1, 1, 0, 0, 1, 1, 1]  # Stop pattern
-            for bar in stop_pattern:
-                if x >= width - 5:
-                    break
-                bar_width = narrow_bar
-                if bar:
-                    draw.rectangle([x, 3, x + bar_width - 1, height - 3], fill='black')
-                x += bar_width
+        # Convert to RGB if needed
+        if logo_img.mode != 'RGB':
+            logo_img = logo_img.convert('RGB')
         
-        return img
+        # Resize logo to specified dimensions
+        return logo_key, logo_img.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
     
-    def generate_label_image(self):
-        """Generate 83mm x 32mm label with P/D, P/N, P/R, S/N fields"""
+    def render_label_background(self, font_company, font_label):
+        """Render the parts of the label that don't change with the data: border, logo and field labels"""
         settings = self.label_settings
         width = settings['width']
         height = settings['height']
@@ -836,32 +1161,18 @@ class EnhancedBarcodeLabelApp:
         img = Image.new('RGB', (width, height), 'white')
         draw = ImageDraw.Draw(img)
         
-        # Load fonts with sizes from settings
-        try:
-            font_company = ImageFont.truetype("arial.ttf", settings.get('font_company_size', 14))
-            font_label = ImageFont.truetype("arial.ttf", settings.get('font_label_size', 10))
-            font_data = ImageFont.truetype("arial.ttf", settings.get('font_data_size', 9))
-            font_dlm = ImageFont.truetype("arial.ttf", settings.get('font_dlm_size', 8))
-        except:
-            font_company = ImageFont.load_default()
-            font_label = font_company
-            font_data = font_company
-            font_dlm = font_company
-        
         # Draw border
         draw.rectangle([0, 0, width-1, height-1], outline='black', width=1)
         
         # 1. Add logo if available
         if settings['logo_path'] and os.path.exists(settings['logo_path']):
             try:
-                logo_img = Image.open(settings['logo_path'])
-                
-                # Convert to RGB if needed
-                if logo_img.mode != 'RGB':
-                    logo_img = logo_img.convert('RGB')
-                
-                # Resize logo to specified dimensions
-                logo_resized = logo_img.resize((settings['logo_width'], settings['logo_height']), Image.Resampling.LANCZOS)
+                # Decode and resize only when the file or logo size changed
+                logo_key = (settings['logo_path'], os.path.getmtime(settings['logo_path']),
+                            settings['logo_width'], settings['logo_height'])
+                if not (self._logo_cache and self._logo_cache[0] == logo_key):
+                    self._logo_cache = self._load_logo(logo_key)
+                logo_resized = self._logo_cache[1]
                 
                 # Paste logo on the label
                 img.paste(logo_resized, (settings['logo_x'], settings['logo_y']))
@@ -874,27 +1185,59 @@ class EnhancedBarcodeLabelApp:
             # No logo - draw fallback text
             draw.text((settings['logo_x'], settings['logo_y']), "CYIENT DLM", fill='black', font=font_company)
         
-        if self.current_excel_data:
-            # Get field data from Excel
-            pd_data = self.get_field_data(['P/D', 'PD', 'DESCRIPTION', 'DESC', 'PRODUCT'])
-            pn_data = self.get_field_data(['P/N', 'PN', 'PART', 'CPN', 'PART_NUMBER'])
-            pr_data = self.get_field_data(['P/R', 'PR', 'REVISION', 'REV', 'VERSION'])
-            
-            # S/N should be the lookup input value (the barcode that was scanned/entered)
-            sn_data = self.barcode_var.get().strip() if hasattr(self, 'barcode_var') and self.barcode_var.get().strip() else "CDL2349-1195"
+        # 2. Field labels - the same four strings on every label, only their position moves
+        for field, x_key, y_key in (("P/D", 'pd_x', 'pd_y'), ("P/N", 'pn_x', 'pn_y'),
+                                    ("P/R", 'pr_x', 'pr_y'), ("S/N", 'sn_x', 'sn_y')):
+            draw.text((settings[x_key], settings[y_key]), field, fill='black', font=font_label)
+        
+        return img
+    
+    def generate_label_image(self):
+        """Generate 83mm x 32mm label with P/D, P/N, P/R, S/N fields (the image is reused by the next call)"""
+        settings = self.label_settings
+        width = settings['width']
+        height = settings['height']
+        
+        # Load fonts with sizes from settings - each set of sizes is only resolved once
+        font_company, font_label, font_data, font_dlm = _label_fonts(
+            settings.get('font_company_size', 14), settings.get('font_label_size', 10),
+            settings.get('font_data_size', 9), settings.get('font_dlm_size', 8))
+        
+        # Border, logo and field labels only depend on these settings - reuse the
+        # last render and redraw just the data (barcodes and text) otherwise
+        logo_path = settings['logo_path']
+        logo_mtime = os.path.getmtime(logo_path) if logo_path and os.path.exists(logo_path) else None
+        background_key = (width, height, logo_path, logo_mtime,
+                          settings['logo_x'], settings['logo_y'],
+                          settings['logo_width'], settings['logo_height'],
+                          settings.get('font_company_size', 14), settings.get('font_label_size', 10),
+                          settings['pd_x'], settings['pd_y'], settings['pn_x'], settings['pn_y'],
+                          settings['pr_x'], settings['pr_y'], settings['sn_x'], settings['sn_y'])
+        if not (self._background_cache and self._background_cache[0] == background_key):
+            self._background_cache = (background_key, self.render_label_background(font_company, font_label))
+        
+        # Fields are drawn onto the scratch image, refilled from the cached
+        # background - the background itself stays clean
+        background = self._background_cache[1]
+        img = self._scratch_img
+        if img is None or img.size != background.size:
+            img = self._scratch_img = Image.new('RGB', background.size)
+        img.paste(background)
+        draw = ImageDraw.Draw(img)
+        
+        if self.current_row is not None:
+            # Get field data from Excel - S/N should be the lookup input value
+            # (the barcode that was scanned/entered), sample values fill any gaps
+            serial = self.barcode_var.get().strip() if hasattr(self, 'barcode_var') else None
+            pd_data, pn_data, pr_data, sn_data = self.label_field_data(self.current_row, serial)
             
-            # Default values if not found
-            if not pd_data: pd_data = "SCB CCA"
-            if not pn_data: pn_data = "CZ5S1000B"
-            if not pr_data: pr_data = "02"
+            # Barcodes below come straight from their caches - paste only reads them
             
             # 3. P/D field (NO BARCODE - text only)
-            draw.text((settings['pd_x'], settings['pd_y']), "P/D", fill='black', font=font_label)
             draw.text((settings['pd_x'] + 30, settings['pd_y']), pd_data, fill='black', font=font_data)
             
             # 4. P/N field
-            draw.text((settings['pn_x'], settings['pn_y']), "P/N", fill='black', font=font_label)
-            pn_barcode = self.generate_barcode(pn_data, settings['barcode_width'], settings['barcode_height'])
+            pn_barcode = _barcode_image(pn_data, settings['barcode_width'], settings['barcode_height'])
             if pn_barcode:
                 img.paste(pn_barcode, (settings['pn_x'] + 30, settings['pn_y'] + 2))
             else:
@@ -902,8 +1245,7 @@ class EnhancedBarcodeLabelApp:
             draw.text((settings['pn_x'] + 30, settings['pn_y'] + settings['barcode_height'] + 5), pn_data, fill='black', font=font_data)
             
             # 5. P/R field
-            draw.text((settings['pr_x'], settings['pr_y']), "P/R", fill='black', font=font_label)
-            pr_barcode = self.generate_barcode(pr_data, settings['barcode_width'], settings['barcode_height'])
+            pr_barcode = _barcode_image(pr_data, settings['barcode_width'], settings['barcode_height'])
             if pr_barcode:
                 img.paste(pr_barcode, (settings['pr_x'] + 30, settings['pr_y'] + 2))
             else:
@@ -911,8 +1253,7 @@ class EnhancedBarcodeLabelApp:
             draw.text((settings['pr_x'] + 30, settings['pr_y'] + settings['barcode_height'] + 5), pr_data, fill='black', font=font_data)
             
             # 6. S/N field
-            draw.text((settings['sn_x'], settings['sn_y']), "S/N", fill='black', font=font_label)
-            sn_barcode = self.generate_barcode(sn_data, settings['barcode_width'], settings['barcode_height'])
+            sn_barcode = _barcode_image(sn_data, settings['barcode_width'], settings['barcode_height'])
             if sn_barcode:
                 img.paste(sn_barcode, (settings['sn_x'] + 30, settings['sn_y'] + 2))
             else:
@@ -922,86 +1263,57 @@ class EnhancedBarcodeLabelApp:
         else:
             # Sample data when no lookup performed
             # Generate sample barcodes for preview (excluding P/D)
-            sample_pn_barcode = self.generate_simple_barcode("CZ5S1000B", settings['barcode_width'], settings['barcode_height'])
-            sample_pr_barcode = self.generate_simple_barcode("02", settings['barcode_width'], settings['barcode_height'])
-            sample_sn_barcode = self.generate_simple_barcode("CDL2349-1195", settings['barcode_width'], settings['barcode_height'])
+            sample_pn_barcode = _simple_barcode_pattern("CZ5S1000B", settings['barcode_width'], settings['barcode_height'])
+            sample_pr_barcode = _simple_barcode_pattern("02", settings['barcode_width'], settings['barcode_height'])
+            sample_sn_barcode = _simple_barcode_pattern("CDL2349-1195", settings['barcode_width'], settings['barcode_height'])
             
             # P/D (NO BARCODE - text only)
-            draw.text((settings['pd_x'], settings['pd_y']), "P/D", fill='black', font=font_label)
             draw.text((settings['pd_x'] + 30, settings['pd_y']), "SCB CCA", fill='black', font=font_data)
             
             # P/N
-            draw.text((settings['pn_x'], settings['pn_y']), "P/N", fill='black', font=font_label)
             img.paste(sample_pn_barcode, (settings['pn_x'] + 30, settings['pn_y']))
             draw.text((settings['pn_x'] + 30, settings['pn_y'] + settings['barcode_height'] + 2), "CZ5S1000B", fill='black', font=font_data)
             
             # P/R
-            draw.text((settings['pr_x'], settings['pr_y']), "P/R", fill='black', font=font_label)
             img.paste(sample_pr_barcode, (settings['pr_x'] + 30, settings['pr_y']))
             draw.text((settings['pr_x'] + 30, settings['pr_y'] + settings['barcode_height'] + 2), "02", fill='black', font=font_data)
             
             # S/N
-            draw.text((settings['sn_x'], settings['sn_y']), "S/N", fill='black', font=font_label)
             img.paste(sample_sn_barcode, (settings['sn_x'] + 30, settings['sn_y']))
             draw.text((settings['sn_x'] + 30, settings['sn_y'] + settings['barcode_height'] + 2), "CDL2349-1195", fill='black', font=font_data)
         
         return img
     
-    def find_column(self, possible_names):
-        """Find a column that matches one of the possible names"""
-        if self.df is None:
+    def find_column_index(self, possible_names, df=None):
+        """Find the position of a column that matches one of the possible names (in df, by default the loaded sheet)"""
+        if df is None:
+            df = self.df
+        if df is None:
             return None
             
         for possible_name in possible_names:
-            for col in self.df.columns:
+            for index, col in enumerate(df.columns):
                 if possible_name.upper() in str(col).upper():
-                    return col
+                    return index
         return None
     
     def extract_serial_number(self, serial_str):
         """Extract numeric part from serial number string"""
-        import re
-        
         # Remove whitespace
-        serial_str = str(serial_str).strip()
-        
-        # Try different patterns to extract numbers
-        patterns = [
-            r'(\d+)$',           # Numbers at the end
-            r'(\d+)',            # Any numbers
-            r'(\d+)-(\d+)',      # Pattern like CDL2349-1195, take the last number
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, serial_str)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    # For patterns like CDL2349-1195, take the last number
-                    return int(matches[0][-1])
-                else:
-                    # Take the last match (most specific)
-                    return int(matches[-1])
-        
-        # If no pattern matches, try to extract any digits and combine them
-        digits = re.findall(r'\d', serial_str)
-        if digits:
-            try:
-                return int(''.join(digits))
-            except ValueError:
-                pass
-        
-        return None
+        return _extract_serial_number(str(serial_str).strip())
     
-    def get_field_data(self, field_names):
-        """Get data for a field from Excel using multiple possible column names"""
-        if not self.current_excel_data:
-            return None
-            
-        for field_name in field_names:
-            for key, value in self.current_excel_data.items():
-                if field_name.upper() in key.upper():
-                    return str(value)
-        return None
+    def label_field_data(self, row=None, serial=None):
+        """Return the (P/D, P/N, P/R, S/N) text for a label (row is a position in self.df), with sample values for anything missing"""
+        if row is None:
+            return ("SCB CCA", "CZ5S1000B", "02", "CDL2349-1195")
+        
+        def field(name, sample):
+            # Column positions were matched when self.df loaded - read the one cell, not the whole row
+            column = self._column_map[name]
+            return (str(self.df.iat[row, column]) if column is not None else None) or sample
+        
+        return (field('P/D', "SCB CCA"), field('P/N', "CZ5S1000B"), field('P/R', "02"),
+                serial or "CDL2349-1195")
     
     def update_preview(self):
         """Update the label preview"""
@@ -1009,11 +1321,12 @@ class EnhancedBarcodeLabelApp:
             # Generate label
             self.current_label = self.generate_label_image()
             
-            # Clear canvas
-            self.preview_canvas.delete("all")
+            # Clear a previous error message (the preview image item is reused)
+            self.preview_canvas.delete("error")
             
-            # Convert PIL image to PhotoImage for display
-            preview_img = self.current_label.copy()
+            # Convert PIL image to PhotoImage for display - only a canvas-sized
+            # copy goes to Tk, current_label stays at full size for save_label
+            preview_img = self.current_label
             
             # Scale to fit canvas while maintaining aspect ratio
             canvas_width = self.preview_canvas.winfo_width()
@@ -1030,49 +1343,76 @@ class EnhancedBarcodeLabelApp:
                 new_width = int(img_width * scale)
                 new_height = int(img_height * scale)
                 
-                preview_img = preview_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # On-screen only - saved PNGs use current_label at full size, so a
+                # cheap filter is enough here, and a label that fits is not resampled
+                if scale < 1.0:
+                    preview_img = preview_img.resize((new_width, new_height), Image.Resampling.BILINEAR)
                 
-                # Convert to PhotoImage
-                from PIL import ImageTk
-                self.preview_photo = ImageTk.PhotoImage(preview_img)
+                # Copy into the existing PhotoImage while the size holds, so Tk
+                # keeps its image and canvas item instead of rebuilding them
+                if self.preview_photo and (self.preview_photo.width(), self.preview_photo.height()) == preview_img.size:
+                    self.preview_photo.paste(preview_img)
+                else:
+                    from PIL import ImageTk
+                    self.preview_photo = ImageTk.PhotoImage(preview_img)
+                    self.preview_canvas.itemconfig(self.preview_image_id, image=self.preview_photo)
                 
                 # Center on canvas
                 x = (canvas_width - new_width) // 2
                 y = (canvas_height - new_height) // 2
                 
-                self.preview_canvas.create_image(x, y, anchor=tk.NW, image=self.preview_photo)
+                self.preview_canvas.coords(self.preview_image_id, x, y)
+                self.preview_canvas.itemconfig(self.preview_image_id, state=tk.NORMAL)
                 
                 # Update info
                 self.preview_info.config(text=f"Preview: {self.label_settings['width']}x{self.label_settings['height']}px")
             
         except Exception as e:
             print(f"Error updating preview: {e}")
-            self.preview_canvas.delete("all")
-            self.preview_canvas.create_text(225, 125, text=f"Preview Error: {e}", anchor=tk.CENTER)
+            self.preview_canvas.delete("error")
+            self.preview_canvas.itemconfig(self.preview_image_id, state=tk.HIDDEN)
+            self.preview_canvas.create_text(225, 125, text=f"Preview Error: {e}", anchor=tk.CENTER, tags="error")
     
     def save_label(self):
-        """Save the current label as PDF"""
+        """Save the current label as PDF (plus a PNG preview), writing the files on a worker thread"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"output_labels/label_{timestamp}.pdf"
             
+            # Everything the files need is gathered here - the worker never touches Tk.
+            # The preview is drawn into a reused buffer, so the PNG gets its own copy
+            serial = self.barcode_var.get().strip() if hasattr(self, 'barcode_var') else None
+            field_data = self.label_field_data(self.current_row, serial)
+            logo_path = self.pdf_logo_path()
+            label = self.current_label.copy() if self.current_label else None
+            png_filename = f"output_labels/label_{timestamp}.png" if label else None
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving label: {e}")
+            print(f"Save error: {e}")  # For debugging
+            return
+        
+        def write_files():
             # Generate PDF label
-            self.generate_pdf_label(filename)
+            _render_pdf_label(filename, logo_path, field_data)
             
             # Also save PNG preview for reference
-            if self.current_label:
-                png_filename = f"output_labels/label_{timestamp}.png"
-                self.current_label.save(png_filename, 'PNG', dpi=(300, 300))
-                
+            if label:
+                label.save(png_filename, 'PNG', dpi=(300, 300))
+        
+        def on_save_failed(error):
+            messagebox.showerror("Error", f"Error saving label: {error}")
+            print(f"Save error: {error}")  # For debugging
+        
+        def on_saved(_):
+            if png_filename:
                 messagebox.showinfo("Success", f"Label saved as:\nPDF: {filename}\nPNG Preview: {png_filename}")
                 self.status_var.set(f"Label saved: {os.path.basename(filename)} + PNG preview")
             else:
                 messagebox.showinfo("Success", f"Label saved as PDF:\n{filename}")
                 self.status_var.set(f"Label saved: {os.path.basename(filename)}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error saving label: {e}")
-            print(f"Save error: {e}")  # For debugging
+        
+        self.status_var.set(f"Saving {os.path.basename(filename)}...")
+        self.run_in_background(write_files, on_saved, on_save_failed)
     
     def print_label(self):
         """Generate and print label as PDF using exact measurements"""
@@ -1145,10 +1485,10 @@ class EnhancedBarcodeLabelApp:
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=tree.xview)
         tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         
-        # Insert data (first 100 rows to avoid performance issues)
-        for idx, row in self.df.head(100).iterrows():
-            values = [str(row[col]) for col in columns]
-            tree.insert('', tk.END, values=values)
+        # Insert data (first 100 rows to avoid performance issues) - plain tuples,
+        # already in column order, instead of a Series per row
+        for row in self.df.head(100).itertuples(index=False, name=None):
+            tree.insert('', tk.END, values=[str(value) for value in row])
         
         # Pack treeview and scrollbars
         tree.grid(row=0, column=0, sticky='nsew')
@@ -1166,267 +1506,109 @@ class EnhancedBarcodeLabelApp:
         """Clear all data"""
         self.barcode_var.set("")
         self.results_text.delete(1.0, tk.END)
-        self.current_excel_data = None
+        self.current_row = None
         self.barcode_entry.focus()
         self.status_var.set("Cleared - Ready for new serial number lookup")
         self.update_preview()
     
     def run(self):
         """Start the application"""
-        # Bind canvas resize event to update preview
-        self.preview_canvas.bind('<Configure>', lambda e: self.root.after(100, self.update_preview))
+        # Bind canvas resize event to update preview - a window drag sends a stream
+        # of these, so they share the debounced redraw instead of queueing one each
+        self.preview_canvas.bind('<Configure>', lambda e: self.schedule_preview(100))
         self.root.mainloop()
 
-    def add_logo_to_canvas(self, canvas_obj, logo_path, x_mm, y_mm, width_mm, height_mm):
-        """Add a logo image to the canvas at the specified position and size"""
-        try:
-            # Check if logo file exists
-            if not os.path.exists(logo_path):
-                print(f"Warning: Logo file not found at {logo_path}")
-                return False
-            
-            # Convert mm to points
-            x_pts = x_mm * mm
-            y_pts = y_mm * mm
-            width_pts = width_mm * mm
-            height_pts = height_mm * mm
-            
-            # Load and draw the image
-            canvas_obj.drawImage(logo_path, x_pts, y_pts, width_pts, height_pts)
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error loading logo from {logo_path}: {e}")
-            # Draw a placeholder rectangle if logo fails to load
-            canvas_obj.setStrokeColor(black)
-            canvas_obj.setFillColor("lightgray")
-            canvas_obj.rect(x_mm * mm, y_mm * mm, width_mm * mm, height_mm * mm, fill=1, stroke=1)
-            
-            # Add text placeholder
-            canvas_obj.setFillColor(black)
-            canvas_obj.setFont("Helvetica", 8)
-            canvas_obj.drawString((x_mm + 2) * mm, (y_mm + height_mm/2) * mm, "LOGO")
-            
-            return False
-
-    def create_barcode_directly(self, canvas_obj, data, x, y, width_mm, height_mm):
-        """Create a barcode directly on the canvas using reportlab's built-in Code128 barcode"""
-        try:
-            # Convert mm to points
-            width_pts = width_mm * mm
-            height_pts = height_mm * mm
-            
-            # Calculate the bar width needed to achieve the desired total width
-            # Code128 typically has about 11 bars per character + start/stop patterns
-            # This is an approximation - we'll create the barcode and scale if needed
-            estimated_bars = len(data) * 11 + 35  # Rough estimate including start/stop/check
-            target_bar_width = width_pts / estimated_bars
-            
-            # Ensure minimum bar width for readability (0.3 points minimum)
-            bar_width = max(0.3, target_bar_width)
-            
-            # Create the barcode with calculated bar width
-            # Code128 automatically starts with the correct start pattern (first bar should be black)
-            barcode = code128.Code128(data, 
-                                     barWidth=bar_width,  # Calculated to achieve target width
-                                     barHeight=height_pts,
-                                     humanReadable=False,  # We'll add text separately
-                                     quiet=0)  # No quiet zones - we control positioning
-            
-            # Get the actual width of the generated barcode
-            actual_width = barcode.width
-            
-            # If the barcode is too wide or too narrow, scale it
-            if actual_width > 0:
-                scale_factor = width_pts / actual_width
-                
-                # Save the current graphics state
-                canvas_obj.saveState()
-                
-                # Apply scaling and draw at the correct position
-                canvas_obj.translate(x, y)
-                canvas_obj.scale(scale_factor, 1.0)  # Scale width only, keep height
-                barcode.drawOn(canvas_obj, 0, 0)
-                
-                # Restore the graphics state
-                canvas_obj.restoreState()
-            else:
-                # Fallback: draw without scaling
-                barcode.drawOn(canvas_obj, x, y)
-            
-            return True
-        except Exception as e:
-            print(f"Error creating barcode for '{data}': {e}")
-            # Draw a placeholder rectangle if barcode fails
-            canvas_obj.setStrokeColor(black)
-            canvas_obj.setFillColor(black)
-            canvas_obj.rect(x, y, width_mm * mm, height_mm * mm, fill=0, stroke=1)
-            return False
-
-    def flip_y(self, y_mm, label_height):
-        """Convert top-left Y coordinate to bottom-left for reportlab"""
-        return label_height - (y_mm * mm)
+    def pdf_logo_path(self):
+        """Logo for PDF labels - the selected logo, else the first default location found"""
+        logo_path = self.label_settings.get('logo_path')
+        if not (logo_path and os.path.exists(logo_path)):
+            logo_path = find_default_logo()
+        return logo_path
 
     def generate_pdf_label(self, filename=None):
         """Generate label as PDF using exact measurements from debug_label_generator_pdf.py"""
-        
-        # Label dimensions in mm (converted from pixels)
-        label_width_mm = 173  # About 490 pixels
-        label_height_mm = 60  # About 170 pixels
-        
-        # Convert to points for reportlab (1 mm = 2.834645669 points)
-        label_width = label_width_mm * mm
-        label_height = label_height_mm * mm
-        
-        # Configuration in mm
-        config_mm = {
-            'logo_x': 5,     # 14px ≈ 5mm
-            'logo_y': 2,     # 6px ≈ 2mm  
-            'logo_width': 35,  # Logo width
-            'logo_height': 17, # Logo height
-            'field_start_x': 45,  # 127px ≈ 45mm
-            'text_offset': 15,     # Offset for barcode/text
-            'barcode_width': 90,  # 255px ≈ 90mm
-            'barcode_height': 8, # 23px ≈ 8mm
-            'field_gap': 5.3,     # Gap between fields
-            'text_bc_offset': 0,  # Text barcode offset
-        }
-        
-        # Field positions in mm (converted from pixel positions)
-        field_positions_mm = {
-            'P/D': 6,   # 17px ≈ 6mm
-            'P/N': 14,  # 40px ≈ 14mm  
-            'P/R': 29,  # 82px ≈ 29mm
-            'S/N': 46   # 130px ≈ 46mm
-        }
-        
         # Create PDF filename if not provided
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"output_labels/label_{timestamp}.pdf"
         
-        # Create PDF canvas with exact label size
-        c = canvas.Canvas(filename, pagesize=(label_width, label_height))
-        
-        # Draw border
-        c.setStrokeColor(black)
-        c.setLineWidth(0.5)
-        c.rect(0, 0, label_width, label_height)
-        
-        # 1. Company logo area
-        # Try to load logo from different possible locations
-        logo_paths = [
-            "logo.png",  # Current directory
-            "assets/logo.png",  # Assets folder
-            "../logo.png",  # Parent directory
-            "assets/logo copy.png"  # Alternative logo
-        ]
-        
-        logo_loaded = False
-        if self.label_settings.get('logo_path') and os.path.exists(self.label_settings['logo_path']):
-            logo_loaded = self.add_logo_to_canvas(c, self.label_settings['logo_path'], 
-                                               config_mm['logo_x'], 
-                                               self.flip_y(config_mm['logo_y'] + config_mm['logo_height'], label_height) / mm,
-                                               config_mm['logo_width'], 
-                                               config_mm['logo_height'])
-        else:
-            for logo_path in logo_paths:
-                if os.path.exists(logo_path):
-                    logo_loaded = self.add_logo_to_canvas(c, logo_path, 
-                                                       config_mm['logo_x'], 
-                                                       self.flip_y(config_mm['logo_y'] + config_mm['logo_height'], label_height) / mm,
-                                                       config_mm['logo_width'], 
-                                                       config_mm['logo_height'])
-                    if logo_loaded:
-                        print(f"Logo loaded from: {logo_path}")
-                        break
-        
-        # Fallback to text if logo not found
-        if not logo_loaded:
-            c.setFont("Helvetica-Bold", 14)
-            c.setFillColor(black)
-            c.drawString(config_mm['logo_x'] * mm, self.flip_y(config_mm['logo_y'] + 4, label_height), "CYIENT")
-            
-            c.setFillColor(blue)
-            c.drawString((config_mm['logo_x'] + 21) * mm, self.flip_y(config_mm['logo_y'] + 4, label_height), "DLM")
-        
-        # Get data from current excel data or use defaults
-        if self.current_excel_data:
-            pd_data = self.get_field_data(['P/D', 'PD', 'DESCRIPTION', 'DESC', 'PRODUCT']) or "SCB CCA"
-            pn_data = self.get_field_data(['P/N', 'PN', 'PART', 'CPN', 'PART_NUMBER']) or "CZ5S1000B"
-            pr_data = self.get_field_data(['P/R', 'PR', 'REVISION', 'REV', 'VERSION']) or "02"
-            sn_data = self.barcode_var.get().strip() if hasattr(self, 'barcode_var') and self.barcode_var.get().strip() else "CDL2349-1195"
-        else:
-            pd_data = "SCB CCA"
-            pn_data = "CZ5S1000B"
-            pr_data = "02"
-            sn_data = "CDL2349-1195"
+        # S/N is the lookup input value (the barcode that was scanned/entered)
+        serial = self.barcode_var.get().strip() if hasattr(self, 'barcode_var') else None
+        _render_pdf_label(filename, self.pdf_logo_path(),
+                          self.label_field_data(self.current_row, serial))
         
-        # 2. P/D field (text only, no barcode)
-        c.setFillColor(black)
-        c.setFont("Helvetica-Bold", 10)
-        pd_y = field_positions_mm['P/D']
-        c.drawString(config_mm['field_start_x'] * mm , self.flip_y(pd_y + 3, label_height), "P/D")
-        
-        c.setFont("Helvetica", 8)
-        c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                     self.flip_y(pd_y + 3, label_height), pd_data)
-        
-        # 3. P/N field (with barcode)
-        c.setFont("Helvetica-Bold", 10)
-        pn_y = field_positions_mm['P/N']
-        c.drawString(config_mm['field_start_x'] * mm, self.flip_y(pn_y + 3, label_height), "P/N")
-        
-        # Draw P/N barcode
-        self.create_barcode_directly(c, pn_data, 
-                               (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                               self.flip_y(pn_y + config_mm['barcode_height'] + 1, label_height),
-                               config_mm['barcode_width'], config_mm['barcode_height'])
-        
-        # P/N text below barcode
-        c.setFont("Helvetica", 8)
-        c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                     self.flip_y(pn_y + config_mm['barcode_height'] + 4, label_height), pn_data)
-        
-        # 4. P/R field (with barcode)
-        c.setFont("Helvetica-Bold", 10)
-        pr_y = field_positions_mm['P/R']
-        c.drawString(config_mm['field_start_x'] * mm, self.flip_y(pr_y + 3, label_height), "P/R")
-        
-        # Draw P/R barcode
-        self.create_barcode_directly(c, pr_data, 
-                               (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                               self.flip_y(pr_y + config_mm['barcode_height'] + 1, label_height),
-                               config_mm['barcode_width'], config_mm['barcode_height'])
-        
-        # P/R text below barcode
-        c.setFont("Helvetica", 8)
-        c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                     self.flip_y(pr_y + config_mm['barcode_height'] + 4, label_height), pr_data)
-        
-        # 5. S/N field (with barcode)
-        c.setFont("Helvetica-Bold", 10)
-        sn_y = field_positions_mm['S/N']
-        c.drawString(config_mm['field_start_x'] * mm, self.flip_y(sn_y + 3, label_height), "S/N")
-        
-        # Draw S/N barcode
-        self.create_barcode_directly(c, sn_data, 
-                               (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                               self.flip_y(sn_y + config_mm['barcode_height'] + 1, label_height),
-                               config_mm['barcode_width'], config_mm['barcode_height'])
-        
-        # S/N text below barcode
-        c.setFont("Helvetica", 8)
-        c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                     self.flip_y(sn_y + config_mm['barcode_height'] + 4, label_height), sn_data)
-        
-        # Save the PDF
-        c.save()
-        
-        print(f"PDF label saved: {filename}")
+        if self.verbose:
+            print(f"PDF label saved: {filename}")
         return filename
 
+    def batch_export_dialog(self):
+        """Pick a serial number list (one per line) and an output folder, then batch export"""
+        serials_file = filedialog.askopenfilename(
+            title="Select Serial Number List",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not serials_file:
+            return
+        outdir = filedialog.askdirectory(title="Select Output Folder", initialdir="output_labels")
+        if not outdir:
+            return
+        
+        with open(serials_file, 'r') as f:
+            serials = [line.strip() for line in f if line.strip()]
+        self.batch_export(serials, outdir)
+
+    def batch_export(self, serials, outdir):
+        """Export one PDF label per serial number, rendered in parallel worker processes"""
+        if self.df is None or self._range_index is None:
+            messagebox.showerror("Error", "Excel file not loaded!")
+            return
+        
+        # Rows are looked up here - the workers only get plain strings to draw
+        filenames, field_data, missing = [], [], []
+        used_names = set()
+        # A serial listed twice still gets one label
+        for serial in dict.fromkeys(serials):
+            serial_num = self.extract_serial_number(serial)
+            found_rows = self.find_range_rows(serial_num) if serial_num is not None else []
+            if not len(found_rows):
+                missing.append(serial)
+                continue
+            row = int(found_rows[0])
+            filenames.append(_label_filename(serial, outdir, used_names))
+            field_data.append(self.label_field_data(row, serial))
+        
+        if not filenames:
+            messagebox.showerror("Error", "No range found for any of the serial numbers!")
+            return
+        
+        logo_paths = [self.pdf_logo_path()] * len(filenames)
+        
+        # No more workers than labels, and about four chunks per worker - big enough
+        # to keep pickling overhead down, small enough to spread a short batch
+        workers = min(os.cpu_count() or 1, len(filenames))
+        chunksize = max(1, -(-len(filenames) // (4 * workers)))
+        
+        def export():
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_render_pdf_label, filenames, logo_paths, field_data,
+                                     chunksize=chunksize))
+        
+        def on_export_failed(error):
+            messagebox.showerror("Error", f"Batch export failed: {error}")
+            self.status_var.set(f"Batch export error: {error}")
+        
+        def on_exported(result):
+            message = f"Exported {len(result)} labels to:\n{outdir}"
+            if missing:
+                message += f"\n\nNo range found for {len(missing)} serial number(s): {', '.join(missing[:10])}"
+            messagebox.showinfo("Batch Export", message)
+            self.status_var.set(f"Batch export: {len(result)} labels saved to {outdir}")
+        
+        self.status_var.set(f"Exporting {len(filenames)} labels...")
+        self.run_in_background(export, on_exported, on_export_failed)
+
 if __name__ == "__main__":
+    # Worker processes of a frozen exe start here too - hand them off before any Tk setup
+    multiprocessing.freeze_support()
     app = EnhancedBarcodeLabelApp()
     app.run()
\ No newline at end of file
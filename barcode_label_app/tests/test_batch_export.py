@@ -0,0 +1,57 @@
+"""Tests for the batch export naming and the worker-side PDF renderer"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simple_barcode_app import _label_filename, _render_pdf_label
+
+# Unsafe characters, a case-only clash and a repeat of an earlier serial
+SERIALS = ["CDL2349/1", "CDL2349_1", "cdl2349-1", "CDL2349-1", "CDL2349-1", "CDL 2349:1"]
+
+
+def label_paths(serials, outdir):
+    """Map serials to PDF paths the way batch_export does, one per distinct serial"""
+    used_names = set()
+    return [_label_filename(serial, outdir, used_names) for serial in dict.fromkeys(serials)]
+
+
+def test_label_filenames_are_safe_and_unique(tmp_path):
+    paths = label_paths(SERIALS, str(tmp_path))
+
+    assert len(paths) == len(set(SERIALS))
+    # Unique even on a case-insensitive filesystem
+    assert len({path.lower() for path in paths}) == len(paths)
+    for path in paths:
+        assert os.path.dirname(path) == str(tmp_path)
+        name = os.path.basename(path)
+        assert name.startswith("label_") and name.endswith(".pdf")
+        assert not set(name) & set('/\\: ')
+
+
+def test_label_filename_numbers_clashes():
+    used_names = set()
+    first = _label_filename("CDL2349/1", "out", used_names)
+    second = _label_filename("CDL2349_1", "out", used_names)
+    third = _label_filename("cdl2349_1", "out", used_names)
+
+    assert os.path.basename(first) == "label_CDL2349_1.pdf"
+    assert os.path.basename(second) == "label_CDL2349_1_2.pdf"
+    assert os.path.basename(third) == "label_cdl2349_1_3.pdf"
+
+
+def test_render_pdf_label_writes_one_file_per_serial(tmp_path):
+    paths = label_paths(SERIALS, str(tmp_path))
+    for path, serial in zip(paths, dict.fromkeys(SERIALS)):
+        _render_pdf_label(path, None, ("SCB CCA", "CZ5S1000B", "02", serial))
+
+    written = sorted(os.listdir(tmp_path))
+    assert written == sorted(os.path.basename(path) for path in paths)
+    contents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    assert all(content.startswith(b"%PDF") for content in contents)
+    # Every serial draws a different label, so identical bytes would mean a
+    # later render overwrote an earlier file
+    assert len(set(contents)) == len(contents)
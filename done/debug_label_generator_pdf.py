@@ -5,43 +5,26 @@ This script generates labels directly as PDF using reportlab for maximum print c
 """
 
 from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm, inch, cm
-from reportlab.lib.pagesizes import letter
-from reportlab.graphics.barcode import code128
-from reportlab.graphics import renderPDF
-from reportlab.graphics.shapes import Drawing
+from reportlab.lib.units import mm
 from reportlab.lib.colors import black, blue
+from concurrent.futures import ProcessPoolExecutor
+import importlib.util
 import os
+import sys
 
-def create_barcode_directly(canvas_obj, data, x, y, width_mm, height_mm):
-    """Create a barcode directly on the canvas using reportlab's built-in Code128 barcode"""
-    try:
-        # Convert mm to points
-        width_pts = width_mm * mm
-        height_pts = height_mm * mm
-        
-        # Create the barcode with proper parameters
-        barcode = code128.Code128(data, 
-                                 barWidth=width_pts,  # Thin bar width in points
-                                 barHeight=height_pts,
-                                 humanReadable=False)  # We'll add text separately
-        
-        # Draw the barcode directly on the canvas
-        barcode.drawOn(canvas_obj, x, y)
-        
-        return True
-    except Exception as e:
-        print(f"Error creating barcode for '{data}': {e}")
-        # Draw a placeholder rectangle if barcode fails
-        canvas_obj.setStrokeColor(black)
-        canvas_obj.setFillColor(black)
-        canvas_obj.rect(x, y, width_mm * mm, height_mm * mm, fill=0, stroke=1)
-        return False
+# Code128 drawing is shared with the live app in ../barcode_label_app - loaded by
+# file path so this archived script does not have to rewrite sys.path
+_CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                          "barcode_label_app", "_barcode_core.py")
+_core_spec = importlib.util.spec_from_file_location("_barcode_core", _CORE_PATH)
+_barcode_core = importlib.util.module_from_spec(_core_spec)
+_core_spec.loader.exec_module(_barcode_core)
+create_barcode_directly = _barcode_core.create_barcode_directly
 
-def create_perfect_pdf_label():
+def create_perfect_pdf_label(log=print):
     """Create a perfectly aligned label directly as PDF using reportlab"""
     
-    print("Creating PDF label with perfect alignment...")
+    log("Creating PDF label with perfect alignment...")
     
     # Label dimensions in mm (converted from pixels: 489px ≈ 172.8mm, 170px ≈ 60mm)
     label_width_mm = 173  # About 489 pixels
@@ -57,7 +40,7 @@ def create_perfect_pdf_label():
         'logo_y': 2,     # 5px ≈ 1.8mm  
         'field_start_x': 65,  # 110px ≈ 38.9mm
         'text_offset': 9,     # 25px ≈ 8.8mm
-        'barcode_width': 300,  # 280px ≈ 98.8mm
+        'barcode_width': 95,  # 280px ≈ 98.8mm, total width - fits the 99mm left of the barcode x
         'barcode_height': 8, # 35px ≈ 12.3mm
         'field_gap': 5.3,     # 15px ≈ 5.3mm
         'text_bc_offset': 6,  # 25px ≈ 8.8mm
@@ -75,7 +58,8 @@ def create_perfect_pdf_label():
     filename = "debug_label_PERFECT_direct.pdf"
     
     # Create PDF canvas with exact label size
-    c = canvas.Canvas(filename, pagesize=(label_width, label_height))
+    # Debug output - skip the zlib pass, these files are small and throwaway
+    c = canvas.Canvas(filename, pagesize=(label_width, label_height), pageCompression=0)
     
     # Set up coordinate system (reportlab uses bottom-left as origin, we want top-left)
     # We'll flip Y coordinates by subtracting from label height
@@ -92,156 +76,199 @@ def create_perfect_pdf_label():
     # 1. Company logo/text area
     c.setFont("Helvetica-Bold", 14)
     c.setFillColor(black)
-    c.drawString(config_mm['logo_x'] * mm, flip_y(config_mm['logo_y'] + 4), "CYIENT")
+    header_y = flip_y(config_mm['logo_y'] + 4)
+    c.drawString(config_mm['logo_x'] * mm, header_y, "CYIENT")
     
     c.setFillColor(blue)
-    c.drawString((config_mm['logo_x'] + 21) * mm, flip_y(config_mm['logo_y'] + 4), "DLM")
-    
-    # 2. P/D field (text only, no barcode)
+    c.drawString((config_mm['logo_x'] + 21) * mm, header_y, "DLM")
+    
+    # Positions in points, computed once for every field
+    label_x = config_mm['field_start_x'] * mm
+    barcode_x = (config_mm['field_start_x'] + config_mm['text_offset']) * mm
+    data_x = (config_mm['field_start_x'] + config_mm['text_offset'] + config_mm['text_bc_offset']) * mm
+    barcode_width = config_mm['barcode_width']
+    barcode_height = config_mm['barcode_height']
+    
+    # (label, label y, data, barcode y or None, data text y) - all flipped to points
+    field_rows = []
+    for label, data, has_barcode in [("P/D", "SCB CCA", False),
+                                     ("P/N", "CZ5S1000B", True),
+                                     ("P/R", "02", True),
+                                     ("S/N", "CDL2349-1195", True)]:
+        y = field_positions_mm[label]
+        if has_barcode:
+            field_rows.append((label, flip_y(y + 3), data,
+                               flip_y(y + barcode_height + 1), flip_y(y + barcode_height + 4)))
+        else:
+            field_rows.append((label, flip_y(y + 3), data, None, flip_y(y + 3)))
+    
+    # 2. Field labels - one text object (a single BT/ET block) for all four
     c.setFillColor(black)
-    c.setFont("Helvetica-Bold", 10)
-    pd_y = field_positions_mm['P/D']
-    c.drawString(config_mm['field_start_x'] * mm , flip_y(pd_y + 3), "P/D")
+    labels = c.beginText()
+    labels.setFont("Helvetica-Bold", 10)
+    for label, label_y, _, _, _ in field_rows:
+        labels.setTextOrigin(label_x, label_y)
+        labels.textOut(label)
+    c.drawText(labels)
+    
+    # 3. Barcodes (P/D is text only)
+    for _, _, data, barcode_y, _ in field_rows:
+        if barcode_y is not None:
+            create_barcode_directly(c, data, barcode_x, barcode_y,
+                                   barcode_width, barcode_height)
+    
+    # 4. Data text - beside the label for P/D, below the barcode for the rest
+    data_text = c.beginText()
+    data_text.setFont("Helvetica", 8)
+    for _, _, data, _, text_y in field_rows:
+        data_text.setTextOrigin(data_x, text_y)
+        data_text.textOut(data)
+    c.drawText(data_text)
     
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, flip_y(pd_y + 3), "SCB CCA")
+    # Save the PDF
+    c.save()
     
-    # 3. P/N field (with barcode)
-    c.setFont("Helvetica-Bold", 10)
-    pn_y = field_positions_mm['P/N']
-    c.drawString(config_mm['field_start_x'] * mm, flip_y(pn_y + 3), "P/N")
+    log(f"Saved: {filename}")
+    log("PDF generated with maximum clarity using reportlab!")
     
-    # Draw P/N barcode
-    create_barcode_directly(c, "CZ5S1000B", 
-                           (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                           flip_y(pn_y + config_mm['barcode_height'] + 1),
-                           config_mm['barcode_width'], config_mm['barcode_height'])
+    # Return configuration in mm (the layout's own unit) - callers that need
+    # the main app's pixel values convert it themselves
+    field_x = config_mm['field_start_x']
+    final_config = {
+        'width': label_width_mm,
+        'height': label_height_mm,
+        'pd_x': field_x, 'pd_y': field_positions_mm['P/D'],
+        'pn_x': field_x, 'pn_y': field_positions_mm['P/N'],
+        'pr_x': field_x, 'pr_y': field_positions_mm['P/R'],
+        'sn_x': field_x, 'sn_y': field_positions_mm['S/N'],
+        'barcode_width': config_mm['barcode_width'],
+        'barcode_height': config_mm['barcode_height'],
+        'text_offset': config_mm['text_offset']
+    }
     
-    # P/N text below barcode
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                 flip_y(pn_y + config_mm['barcode_height'] + 4), "CZ5S1000B")
+    return final_config
+
+# Test label geometry in points - shared by every height test
+TEST_LABEL_SIZE = (173 * mm, 60 * mm)
+TEST_LABEL_X = 39 * mm
+TEST_BARCODE_X = 48 * mm
+TEST_TITLE_Y = TEST_LABEL_SIZE[1] - 2 * mm    # 2mm from the top
+TEST_FIELD_Y = TEST_LABEL_SIZE[1] - 15 * mm   # P/N label baseline, barcode top
+
+def _draw_height_chrome(c):
+    """Draw the parts of a height test label that are the same on every page"""
+    label_width, label_height = TEST_LABEL_SIZE
     
-    # 4. P/R field (with barcode)
-    c.setFont("Helvetica-Bold", 10)
-    pr_y = field_positions_mm['P/R']
-    c.drawString(config_mm['field_start_x'] * mm, flip_y(pr_y + 3), "P/R")
+    # Draw border
+    c.setStrokeColor(black)
+    c.setLineWidth(0.5)
+    c.rect(0, 0, label_width, label_height)
     
-    # Draw P/R barcode
-    create_barcode_directly(c, "02", 
-                           (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                           flip_y(pr_y + config_mm['barcode_height'] + 1),
-                           config_mm['barcode_width'], config_mm['barcode_height'])
+    # Field label for the test barcode
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(TEST_LABEL_X, TEST_FIELD_Y, "P/N")
+
+def _draw_height_label(c, height_mm, chrome_form=None):
+    """Draw one barcode-height test label onto the current page of c"""
+    # Everything below the title hangs off the barcode's bottom edge
+    barcode_y = TEST_FIELD_Y - height_mm * mm
     
-    # P/R text below barcode
-    c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                 flip_y(pr_y + config_mm['barcode_height'] + 4), "02")
+    # Stamp the shared chrome if it has been recorded as a form, else draw it
+    if chrome_form:
+        c.doForm(chrome_form)
+    else:
+        _draw_height_chrome(c)
     
-    # 5. S/N field (with barcode)
-    c.setFont("Helvetica-Bold", 10)
-    sn_y = field_positions_mm['S/N']
-    c.drawString(config_mm['field_start_x'] * mm, flip_y(sn_y + 3), "S/N")
+    # Title
+    c.setFont("Helvetica-Bold", 8)
+    c.drawString(5 * mm, TEST_TITLE_Y, f"Test: Barcode Height {height_mm}mm")
     
-    # Draw S/N barcode
-    create_barcode_directly(c, "CDL2349-1195", 
-                           (config_mm['field_start_x'] + config_mm['text_offset']) * mm, 
-                           flip_y(sn_y + config_mm['barcode_height'] + 1),
-                           config_mm['barcode_width'], config_mm['barcode_height'])
+    # Create barcode with test height
+    create_barcode_directly(c, "CZ5S1000B", TEST_BARCODE_X, barcode_y, 99, height_mm)
     
-    # S/N text below barcode
     c.setFont("Helvetica", 8)
-    c.drawString((config_mm['field_start_x'] + config_mm['text_offset']+config_mm['text_bc_offset']) * mm, 
-                 flip_y(sn_y + config_mm['barcode_height'] + 4), "CDL2349-1195")
-    
-    # Save the PDF
+    c.drawString(TEST_BARCODE_X, barcode_y - 3 * mm, "CZ5S1000B")
+
+def _render_test_label(height_mm):
+    """Write one barcode-height test to its own PDF (top level so worker processes can run it)"""
+    filename = f"debug_label_test_height_{height_mm}mm.pdf"
+    c = canvas.Canvas(filename, pagesize=TEST_LABEL_SIZE, pageCompression=0)
+    _draw_height_label(c, height_mm)
     c.save()
-    
-    print(f"Saved: {filename}")
-    print("PDF generated with maximum clarity using reportlab!")
-    
-    # Return configuration for main app (convert back to pixels for consistency)
-    final_config = {
-        'width': int(label_width_mm * 2.834),  # Convert mm back to approx pixels
-        'height': int(label_height_mm * 2.834),
-        'pd_x': int(config_mm['field_start_x'] * 2.834), 
-        'pd_y': int(field_positions_mm['P/D'] * 2.834),
-        'pn_x': int(config_mm['field_start_x'] * 2.834), 
-        'pn_y': int(field_positions_mm['P/N'] * 2.834),
-        'pr_x': int(config_mm['field_start_x'] * 2.834), 
-        'pr_y': int(field_positions_mm['P/R'] * 2.834),
-        'sn_x': int(config_mm['field_start_x'] * 2.834), 
-        'sn_y': int(field_positions_mm['S/N'] * 2.834),
-        'barcode_width': int(config_mm['barcode_width'] * 2.834), 
-        'barcode_height': int(config_mm['barcode_height'] * 2.834),
-        'text_offset': int(config_mm['text_offset'] * 2.834)
-    }
-    
-    print("\nConfig for main app (pixel values):")
-    print(f'"width": {final_config["width"]},')
-    print(f'"height": {final_config["height"]},')
-    print(f'"pd_x": {final_config["pd_x"]}, "pd_y": {final_config["pd_y"]},')
-    print(f'"pn_x": {final_config["pn_x"]}, "pn_y": {final_config["pn_y"]},')
-    print(f'"pr_x": {final_config["pr_x"]}, "pr_y": {final_config["pr_y"]},')
-    print(f'"sn_x": {final_config["sn_x"]}, "sn_y": {final_config["sn_y"]},')
-    print(f'"barcode_width": {final_config["barcode_width"]}, "barcode_height": {final_config["barcode_height"]}')
-    
-    return final_config
+    return filename
 
-def create_multiple_test_labels():
+def create_multiple_test_labels(separate_files=True, executor=None, log=print):
     """Create multiple test labels to fine-tune spacing and barcode size"""
     
-    print("\nCreating test labels with different barcode sizes...")
+    log("\nCreating test labels with different barcode sizes...")
     
     # Test different barcode heights
     test_heights = [8, 10, 12, 15]  # in mm
     
-    for height_mm in test_heights:
-        filename = f"debug_label_test_height_{height_mm}mm.pdf"
-        
-        # Label dimensions
-        label_width = 173 * mm
-        label_height = 60 * mm
-        
-        c = canvas.Canvas(filename, pagesize=(label_width, label_height))
-        
-        def flip_y(y_mm):
-            return label_height - (y_mm * mm)
-        
-        # Draw border
-        c.setStrokeColor(black)
-        c.setLineWidth(0.5)
-        c.rect(0, 0, label_width, label_height)
+    if separate_files:
+        # Independent PDFs - spread them across worker processes
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=min(len(test_heights), os.cpu_count() or 1)) as pool:
+                filenames = list(pool.map(_render_test_label, test_heights))
+        else:
+            filenames = list(executor.map(_render_test_label, test_heights))
         
-        # Title
-        c.setFont("Helvetica-Bold", 8)
-        c.drawString(5 * mm, flip_y(2), f"Test: Barcode Height {height_mm}mm")
-        
-        # Test barcode with different height
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(39 * mm, flip_y(15), "P/N")
-        
-        # Create barcode with test height
-        create_barcode_directly(c, "CZ5S1000B", 48 * mm, flip_y(15 + height_mm), 99, height_mm)
-        
-        c.setFont("Helvetica", 8)
-        c.drawString(48 * mm, flip_y(15 + height_mm + 3), "CZ5S1000B")
-        
-        c.save()
-        print(f"Created: {filename}")
+        for filename in filenames:
+            log(f"Created: {filename}")
+        return filenames
+    
+    # Opt-in: one page per height in a single PDF - fonts, xref and trailer are written once
+    filename = "debug_label_test_heights.pdf"
+    # No page compression for the test labels either
+    c = canvas.Canvas(filename, pagesize=TEST_LABEL_SIZE, pageCompression=0)
+    
+    # Border and field label are recorded once and referenced from every page
+    c.beginForm("height_chrome")
+    _draw_height_chrome(c)
+    c.endForm()
+    
+    for height_mm in test_heights:
+        _draw_height_label(c, height_mm, chrome_form="height_chrome")
+        c.showPage()
+    
+    c.save()
+    log(f"Created: {filename} ({len(test_heights)} pages)")
+    return [filename]
+
+def _run_collecting_output(func, *args):
+    """Run func(*args, log=...) and return (result, logged lines) - workers report through the parent"""
+    lines = []
+    return func(*args, log=lines.append), lines
 
 if __name__ == "__main__":
     print("Debug Label Generator - Direct PDF Output")
     print("========================================")
     
-    # Create the main perfect PDF label
-    perfect_config = create_perfect_pdf_label()
+    # One PDF per height by default, rendered in parallel - pass --combined for
+    # a single PDF with one page per height
+    separate_files = "--combined" not in sys.argv
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Create the main perfect PDF label alongside the barcode height tests.
+        # Both only collect their progress lines, printed below in submission
+        # order so parallel output never interleaves
+        perfect_future = executor.submit(_run_collecting_output, create_perfect_pdf_label)
+        test_lines = []
+        create_multiple_test_labels(separate_files, executor, log=test_lines.append)
+        perfect_config, perfect_lines = perfect_future.result()
+    
+    for line in perfect_lines + test_lines:
+        print(line)
     
-    # Create test labels with different barcode heights
-    create_multiple_test_labels()
+    # The label config comes back in mm - the main app works in pixels (1px = 1pt)
+    print("\nConfig for main app (pixel values):\n"
+          + _barcode_core.format_app_config(_barcode_core.config_mm_to_px(perfect_config)))
     
     print("\nDone! Generated files:")
     print("- debug_label_PERFECT_direct.pdf (main output)")
-    print("- debug_label_test_height_*.pdf (barcode height tests)")
+    if separate_files:
+        print("- debug_label_test_height_*.pdf (barcode height tests)")
+    else:
+        print("- debug_label_test_heights.pdf (barcode height tests, one page each)")
     print("\nThe PDF files will have maximum print clarity!")
     print("Open them to verify the layout and barcode quality.")